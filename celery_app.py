@@ -1,6 +1,7 @@
 """Celery application configuration."""
 
 from celery import Celery
+from celery.signals import worker_process_init
 
 # Create Celery app
 app = Celery('dealdriver_hubspot')
@@ -17,5 +18,13 @@ app.conf.update(
 # Auto-discover tasks
 app.autodiscover_tasks(['src.tasks'])
 
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    """Build per-process resources once instead of on every task."""
+    from src.tasks.enrich import init_analyzer
+    init_analyzer()
+
+
 # Make app available at module level
 __all__ = ['app']
\ No newline at end of file
@@ -18,14 +18,23 @@ enable_utc = True
 # Task routing
 task_routes = {
     'src.tasks.celery_tasks.scrape_domain': {'queue': 'scraping'},
+    'tasks.bulk_scrape_async': {'queue': 'scraping'},
+    'src.tasks.celery_tasks.enrich_domain': {'queue': 'enrichment'},
     'src.tasks.celery_tasks.enrich_company': {'queue': 'enrichment'},
     'src.tasks.celery_tasks.enrich_leads': {'queue': 'enrichment'},
     'src.tasks.celery_tasks.export_company_csv': {'queue': 'export'},
     'src.tasks.celery_tasks.export_leads_csv': {'queue': 'export'},
+    'src.tasks.celery_tasks.export_company_csv_batch': {'queue': 'export'},
+    'src.tasks.celery_tasks.export_leads_csv_batch': {'queue': 'export'},
 }
 
 # Worker configuration
-worker_prefetch_multiplier = 1
+# Scrape/enrich tasks are long-running, so reserve one task per process
+# (run workers with -Ofair) and ack after completion so a crashed worker's
+# in-flight task is redelivered.
+worker_prefetch_multiplier = int(os.environ.get('CELERY_WORKER_PREFETCH_MULTIPLIER', '1'))
+task_acks_late = True
+task_reject_on_worker_lost = True
 worker_max_tasks_per_child = 100
 
 # Task time limits
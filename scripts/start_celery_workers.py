@@ -47,7 +47,8 @@ def start_workers():
             f"--hostname={worker['name']}@%h",
             f"--queues={worker['queue']}",
             f"--concurrency={worker['concurrency']}",
-            f"--pool={worker['pool']}"
+            f"--pool={worker['pool']}",
+            "-Ofair"
         ]
         
         print(f"Starting {worker['name']} with command: {' '.join(cmd)}")
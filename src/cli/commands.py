@@ -25,7 +25,8 @@ class EnrichmentCommand:
         self.settings = settings
         self.hubspot = HubSpotService(settings.hubspot_token)
         
-        num_workers = getattr(settings, 'num_workers', 4)
+        # None lets the worker pool size itself from API rate limits
+        num_workers = getattr(settings, 'num_workers', None)
         scraping_depth = getattr(settings, 'scraping_depth', 2)
         
         # Use multi-page enrichment service if depth > 0
@@ -6,8 +6,10 @@ from pathlib import Path
 from dataclasses import dataclass
 from typing import Optional
 
-# Add common library to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "common"))
+# Add common library to path, once per process
+_COMMON_PATH = str(Path(__file__).parent.parent.parent.parent / "common")
+if _COMMON_PATH not in sys.path:
+    sys.path.insert(0, _COMMON_PATH)
 
 from utils.config import Config
 
@@ -37,6 +37,11 @@ class ExportConfig:
     DEFAULT_COMPANY_FILENAME = "enriched_companies.csv"
     DEFAULT_LEADS_FILENAME = "enriched_leads.csv"
     COMPANY_NAME_FORMAT = "{domain} ({owner})"
+    # Incremental writers flush after this many rows or seconds
+    FLUSH_EVERY_ROWS = 64
+    FLUSH_INTERVAL_SECONDS = 0.5
+    # Write buffer for exporter CSV files
+    WRITE_BUFFER_BYTES = 1 << 20
 
 
 # Legacy constants for backward compatibility
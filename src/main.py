@@ -88,8 +88,8 @@ def main() -> int:
     parser.add_argument(
         "--workers",
         type=int,
-        default=4,
-        help="Number of concurrent workers for processing (default: 4)"
+        default=None,
+        help="Number of concurrent workers for processing (default: sized from API rate limits)"
     )
     parser.add_argument(
         "--no-celery",
@@ -134,8 +134,8 @@ def main() -> int:
             scraping_depth=args.scraping_depth
         )
         settings.num_workers = args.workers
-        logger.info("Settings initialized - Workers: %d, Log Level: %s", 
-                   settings.num_workers, settings.log_level)
+        logger.info("Settings initialized - Workers: %s, Log Level: %s", 
+                   settings.num_workers or "auto", settings.log_level)
         
         logger.debug("Initializing EnrichmentCommand")
         command = EnrichmentCommand(settings)
@@ -3,10 +3,11 @@
 import luigi
 import logging
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 
 from src.tasks.celery_tasks import process_domain_pipeline
+from src.tasks.export import COMPANY_FIELDNAMES, LEAD_FIELDNAMES
 from src.utils.file_processor import DomainFileProcessor
 
 logger = logging.getLogger(__name__)
@@ -33,7 +34,7 @@ class DomainPipeline:
         output_dir: str = "output",
         use_celery: bool = True,
         import_to_hubspot: bool = False
-    ) -> None:
+    ) -> Tuple[str, str]:
         """
         Process domains from a file using the pipeline.
         
@@ -42,6 +43,10 @@ class DomainPipeline:
             output_dir: Directory for CSV outputs
             use_celery: Whether to use Celery for distributed processing
             import_to_hubspot: Whether to import results to HubSpot after CSV export
+            
+        Returns:
+            Tuple of (company_csv, leads_csv) paths of the timestamped CSV
+            files written to output_dir
         """
         logger.info(f"Processing domains from {input_file}")
         
@@ -68,6 +73,8 @@ class DomainPipeline:
         # Import to HubSpot if requested
         if import_to_hubspot and self.hubspot_token:
             self._import_to_hubspot(str(company_csv), str(leads_csv))
+        
+        return str(company_csv), str(leads_csv)
     
     def _process_with_celery(
         self,
@@ -76,7 +83,7 @@ class DomainPipeline:
         leads_csv: str
     ) -> None:
         """Process domains using Celery for distributed execution."""
-        from src.tasks.celery_tasks import scrape_domain, enrich_company, enrich_leads
+        from src.tasks.celery_tasks import scrape_domain, enrich_domain
         import time
         
         logger.info(f"Processing {len(domains)} domains with Celery")
@@ -103,23 +110,13 @@ class DomainPipeline:
         # Phase 2: Enrich companies and leads sequentially
         logger.info("Phase 2: Enriching companies and leads...")
         for domain in domains:
-            # Enrich company
-            logger.info(f"Enriching company data for {domain}...")
+            logger.info(f"Enriching company and leads data for {domain}...")
             try:
-                company_result = enrich_company.delay(domain)
-                company_result.get(timeout=600)  # 10 minute timeout
-                logger.info(f"Company enrichment completed for {domain}")
+                enrich_result = enrich_domain.delay(domain)
+                enrich_result.get(timeout=600)  # 10 minute timeout
+                logger.info(f"Enrichment completed for {domain}")
             except Exception as e:
-                logger.error(f"Company enrichment failed for {domain}: {str(e)}")
-            
-            # Enrich leads
-            logger.info(f"Enriching leads data for {domain}...")
-            try:
-                leads_result = enrich_leads.delay(domain)
-                leads_result.get(timeout=600)  # 10 minute timeout
-                logger.info(f"Leads enrichment completed for {domain}")
-            except Exception as e:
-                logger.error(f"Leads enrichment failed for {domain}: {str(e)}")
+                logger.error(f"Enrichment failed for {domain}: {str(e)}")
         
         logger.info("Enrichment phase completed.")
         
@@ -138,19 +135,15 @@ class DomainPipeline:
         leads_csv: str
     ) -> None:
         """Process domains using Luigi local scheduler."""
-        from src.tasks.export import ExportAllCSVTask
+        from src.tasks.export import ExportCompanyCSVBatchTask, ExportLeadsCSVBatchTask
         
         logger.info(f"Processing {len(domains)} domains with Luigi local scheduler")
         
-        # Create Luigi tasks for all domains
-        tasks = []
-        for domain in domains:
-            task = ExportAllCSVTask(
-                domain=domain,
-                company_csv=company_csv,
-                leads_csv=leads_csv
-            )
-            tasks.append(task)
+        # One export task per CSV; each pulls in the per-domain enrichment tasks
+        tasks = [
+            ExportCompanyCSVBatchTask(domains=domains, output_file=company_csv),
+            ExportLeadsCSVBatchTask(domains=domains, output_file=leads_csv)
+        ]
         
         # Run all tasks
         luigi.build(tasks, local_scheduler=True, log_level='INFO')
@@ -177,8 +170,8 @@ class DomainPipeline:
             hubspot_token=self.hubspot_token
         )
         
-        # Run import task
-        luigi.build([import_task], local_scheduler=True, log_level='INFO')
+        # Run import task; two workers import companies and leads in parallel
+        luigi.build([import_task], local_scheduler=True, workers=2, log_level='INFO')
         
         logger.info("HubSpot import completed")
     
@@ -187,31 +180,17 @@ class DomainPipeline:
         import csv
         from pathlib import Path
         
-        # Company CSV headers
-        company_headers = [
-            "domain", "enriched_at", "success", "error", "scraped_url",
-            "emails_found", "business_type", "naics_code", "target_market",
-            "products_services", "value_propositions", "competitive_advantages",
-            "technologies", "certifications", "pain_points", "confidence_score"
-        ]
-        
-        # Lead CSV headers
-        lead_headers = [
-            "email", "first_name", "last_name", "company_domain",
-            "enriched_at", "error", "buyer_persona", "lead_score_adjustment"
-        ]
-        
         # Create company CSV
         Path(company_csv).parent.mkdir(parents=True, exist_ok=True)
         with open(company_csv, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
-            writer.writerow(company_headers)
+            writer.writerow(COMPANY_FIELDNAMES)
         
         # Create leads CSV
         Path(leads_csv).parent.mkdir(parents=True, exist_ok=True)
         with open(leads_csv, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
-            writer.writerow(lead_headers)
+            writer.writerow(LEAD_FIELDNAMES)
     
     def _export_results_to_csv(self, domains: List[str], company_csv: str, leads_csv: str) -> None:
         """Export enriched results to CSV files."""
@@ -222,46 +201,37 @@ class DomainPipeline:
         companies_written = 0
         leads_written = 0
         
-        for domain in domains:
-            try:
-                # Export company data
-                company_file = Path(f"data/enriched_companies/raw/{domain}.json")
-                if company_file.exists():
-                    with open(company_file, 'r') as f:
-                        company_data = json.load(f)
-                    
-                    row = self._prepare_company_row(company_data)
-                    with open(company_csv, 'a', newline='', encoding='utf-8') as f:
-                        fieldnames = [
-                            "domain", "enriched_at", "success", "error", "scraped_url",
-                            "emails_found", "business_type", "naics_code", "target_market",
-                            "products_services", "value_propositions", "competitive_advantages",
-                            "technologies", "certifications", "pain_points", "confidence_score"
-                        ]
-                        writer = csv.DictWriter(f, fieldnames=fieldnames)
-                        writer.writerow(row)
-                    companies_written += 1
-                
-                # Export leads data
-                leads_file = Path(f"data/enriched_leads/raw/{domain}.json")
-                if leads_file.exists():
-                    with open(leads_file, 'r') as f:
-                        leads_data = json.load(f)
+        # Open each CSV once for the whole export
+        with open(company_csv, 'a', newline='', encoding='utf-8') as company_f, \
+             open(leads_csv, 'a', newline='', encoding='utf-8') as leads_f:
+            company_writer = csv.DictWriter(company_f, fieldnames=COMPANY_FIELDNAMES)
+            leads_writer = csv.DictWriter(leads_f, fieldnames=LEAD_FIELDNAMES)
+            
+            for domain in domains:
+                try:
+                    # Export company data
+                    company_file = Path(f"data/enriched_companies/raw/{domain}.json")
+                    if company_file.exists():
+                        with open(company_file, 'r') as f:
+                            company_data = json.load(f)
+                        
+                        company_writer.writerow(self._prepare_company_row(company_data))
+                        companies_written += 1
                     
-                    leads = leads_data.get("leads", [])
-                    if leads:
-                        rows = [self._prepare_lead_row(lead, leads_data) for lead in leads]
-                        with open(leads_csv, 'a', newline='', encoding='utf-8') as f:
-                            fieldnames = [
-                                "email", "first_name", "last_name", "company_domain",
-                                "enriched_at", "error", "buyer_persona", "lead_score_adjustment"
-                            ]
-                            writer = csv.DictWriter(f, fieldnames=fieldnames)
-                            writer.writerows(rows)
-                        leads_written += len(rows)
+                    # Export leads data
+                    leads_file = Path(f"data/enriched_leads/raw/{domain}.json")
+                    if leads_file.exists():
+                        with open(leads_file, 'r') as f:
+                            leads_data = json.load(f)
                         
-            except Exception as e:
-                logger.warning(f"Failed to export data for {domain}: {str(e)}")
+                        leads = leads_data.get("leads", [])
+                        if leads:
+                            rows = [self._prepare_lead_row(lead, leads_data) for lead in leads]
+                            leads_writer.writerows(rows)
+                            leads_written += len(rows)
+                            
+                except Exception as e:
+                    logger.warning(f"Failed to export data for {domain}: {str(e)}")
         
         logger.info(f"Exported {companies_written} companies and {leads_written} leads to CSV")
     
@@ -13,6 +13,9 @@ logger = logging.getLogger(__name__)
 class AIAnalyzer:
     """Service for AI-powered content analysis."""
     
+    # Maximum number of leads analyzed in a single request
+    LEAD_BATCH_SIZE = 10
+    
     def __init__(self):
         """Initialize analyzer."""
         logger.info("Initializing AIAnalyzer")
@@ -21,8 +24,10 @@ class AIAnalyzer:
             from pathlib import Path
             # Add common library to path
             common_path = Path(__file__).parent.parent.parent.parent / "common"
-            logger.debug("Adding common path to sys.path: %s", common_path)
-            sys.path.insert(0, str(common_path))
+            # Only the first analyzer needs to add it
+            if str(common_path) not in sys.path:
+                logger.debug("Adding common path to sys.path: %s", common_path)
+                sys.path.insert(0, str(common_path))
             
             logger.debug("Importing DeepSeekClient from common library")
             from clients.deepseek import DeepSeekClient
@@ -118,6 +123,95 @@ class AIAnalyzer:
             logger.debug("Lead analysis error details", exc_info=True)
             return None
     
+    def analyze_leads_batch(self, content: str, lead_infos: List[Dict[str, any]]) -> List[Optional[LeadAnalysis]]:
+        """Analyze several leads that share the same website content.
+        
+        Leads are sent LEAD_BATCH_SIZE at a time, one request per group, and
+        results are returned in the same order as lead_infos. A group whose
+        response cannot be parsed falls back to per-lead analysis.
+        """
+        logger.info("Starting batch lead analysis for %d leads", len(lead_infos))
+        
+        if not self.client:
+            logger.error("DeepSeekClient not available for lead analysis")
+            return [None] * len(lead_infos)
+        
+        results = []
+        for start in range(0, len(lead_infos), self.LEAD_BATCH_SIZE):
+            group = lead_infos[start:start + self.LEAD_BATCH_SIZE]
+            analyses = self._analyze_lead_group(content, group) if len(group) > 1 else None
+            if analyses is None:
+                analyses = [self.analyze_lead(content, lead_info) for lead_info in group]
+            results.extend(analyses)
+        
+        return results
+    
+    def _analyze_lead_group(self, content: str, lead_infos: List[Dict[str, any]]) -> Optional[List[Optional[LeadAnalysis]]]:
+        """Analyze a group of leads in a single request; None if the response is unusable."""
+        leads_text = "\n".join(
+            f"        {i}. Name: {lead_info.get('firstname', '')} {lead_info.get('lastname', '')}, "
+            f"Company: {lead_info.get('company', '')}, Email: {lead_info.get('email', '')}"
+            for i, lead_info in enumerate(lead_infos, 1)
+        )
+        
+        prompt = f"""
+        Analyze the following website content to determine the buyer persona and lead score adjustment
+        for each of the leads listed below.
+        
+        Leads:
+{leads_text}
+        
+        Website Content (may be incomplete due to JavaScript rendering):
+        {content[:4000]}
+        
+        Based on available information, make your best assessment. If content is limited, use:
+        - Email domain patterns (e.g., corporate vs personal email)
+        - Any visible company information
+        - Technical indicators in the HTML/JS if present
+        
+        Provide a JSON array with exactly one object per lead, in the same order as listed:
+        [
+            {{
+                "buyer_persona": "One of: Technical Decision Maker, Business Executive, End User, Influencer, Unknown",
+                "lead_score_adjustment": -10 to +10 based on fit (use 0 if uncertain),
+                "confidence": 0.0 to 1.0 (lower confidence if limited data),
+                "reasoning": "Brief explanation of your assessment"
+            }}
+        ]
+        """
+        
+        try:
+            logger.debug("Sending batch lead analysis request for %d leads", len(lead_infos))
+            response = self.client.chat_completion(
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.7,
+                max_tokens=500 * len(lead_infos)
+            )
+            response_content = response['choices'][0]['message']['content']
+            
+            import re
+            json_match = re.search(r'\[.*\]', response_content, re.DOTALL)
+            data = json.loads(json_match.group() if json_match else response_content)
+            
+            if not isinstance(data, list) or len(data) != len(lead_infos):
+                logger.warning("Batch lead analysis returned %s results for %d leads, falling back",
+                               len(data) if isinstance(data, list) else "invalid", len(lead_infos))
+                return None
+            
+            return [
+                LeadAnalysis(
+                    buyer_persona=item["buyer_persona"],
+                    lead_score_adjustment=item["lead_score_adjustment"],
+                    confidence=item["confidence"],
+                    reasoning=item["reasoning"]
+                )
+                for item in data
+            ]
+        except Exception as e:
+            logger.warning("Batch lead analysis failed, falling back to per-lead analysis: %s", e)
+            logger.debug("Batch lead analysis error details", exc_info=True)
+            return None
+    
     def analyze_company(self, content: str, domain: str = None, emails: List[str] = None) -> Optional[CompanyAnalysis]:
         """Analyze content for company enrichment using sophisticated DeepSeek analysis."""
         logger.info("Starting company analysis for domain: %s", domain or "unknown")
@@ -126,8 +126,10 @@ class BrowserPool:
             
             try:
                 import sys
-                # Add the common directory to Python path
-                sys.path.insert(0, '/home/tspires/Development/common')
+                # Add the common directory to Python path; only the first
+                # browser created needs to
+                if '/home/tspires/Development/common' not in sys.path:
+                    sys.path.insert(0, '/home/tspires/Development/common')
                 
                 from scrape.selenium_scraper import SeleniumScraper
                 from scrape.base_scraper import ScraperConfig
@@ -19,12 +19,13 @@ logger = logging.getLogger(__name__)
 class ConcurrentEnrichmentService:
     """Service for enriching multiple domains concurrently."""
     
-    def __init__(self, num_workers: int = 4, scraping_depth: Optional[int] = None):
+    def __init__(self, num_workers: Optional[int] = None, scraping_depth: Optional[int] = None):
         """
         Initialize concurrent enrichment service.
         
         Args:
-            num_workers: Number of concurrent workers
+            num_workers: Number of concurrent workers, or None to size the
+                pool from the rate limits of the APIs used
             scraping_depth: Maximum scraping depth (None uses default)
         """
         self.num_workers = num_workers
@@ -87,7 +88,7 @@ class ConcurrentEnrichmentService:
         Returns:
             Tuple of (results, errors)
         """
-        logger.info(f"Starting concurrent enrichment of {len(domains)} domains with {self.num_workers} workers")
+        logger.info(f"Starting concurrent enrichment of {len(domains)} domains with {self.num_workers or 'auto'} workers")
         
         # Process domains in parallel with rate limiting
         results, errors = batch_process_with_progress(
@@ -132,7 +133,7 @@ class ConcurrentEnrichmentService:
             
             return result
         
-        logger.info(f"Starting concurrent enrichment of {len(companies)} companies with {self.num_workers} workers")
+        logger.info(f"Starting concurrent enrichment of {len(companies)} companies with {self.num_workers or 'auto'} workers")
         
         # Process companies in parallel
         results, errors = batch_process_with_progress(
@@ -205,7 +206,7 @@ class ConcurrentEnrichmentService:
             
             return result
         
-        logger.info(f"Starting concurrent enrichment of {len(leads)} leads with {self.num_workers} workers")
+        logger.info(f"Starting concurrent enrichment of {len(leads)} leads with {self.num_workers or 'auto'} workers")
         
         # Process leads in parallel
         results, errors = batch_process_with_progress(
@@ -20,7 +20,9 @@ class HubSpotService:
             from pathlib import Path
             # Add common library to path
             common_path = Path(__file__).parent.parent.parent.parent / "common"
-            sys.path.insert(0, str(common_path))
+            # Only the first service instance needs to add it
+            if str(common_path) not in sys.path:
+                sys.path.insert(0, str(common_path))
             
             from clients.hubspot import HubSpotClient
             self.client = HubSpotClient(access_token=token)
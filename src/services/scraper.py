@@ -1,5 +1,6 @@
 """Web scraping service."""
 
+import html
 import logging
 import re
 import time
@@ -12,6 +13,33 @@ from src.utils.domain import extract_domain, normalize_url
 
 logger = logging.getLogger(__name__)
 
+# Pages below this size are stripped with regexes instead of a DOM parser
+SMALL_PAGE_THRESHOLD = 8192
+
+_SCRIPT_STYLE_RE = re.compile(r'<(script|style)\b[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+
+def _extract_text(html_content: str) -> str:
+    """Extract visible text from HTML.
+
+    Small pages (contact/about) use a regex strip to avoid BeautifulSoup
+    setup cost; larger pages go through the DOM parser.
+    """
+    if len(html_content) < SMALL_PAGE_THRESHOLD:
+        text = _TAG_RE.sub(' ', _SCRIPT_STYLE_RE.sub(' ', html_content))
+        return _WS_RE.sub(' ', html.unescape(text)).strip()
+
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html_content, 'html.parser')
+
+    # Remove script and style elements
+    for script in soup(["script", "style"]):
+        script.decompose()
+
+    return soup.get_text(separator=' ', strip=True)
+
 
 class WebScraper:
     """Service for scraping website content."""
@@ -34,8 +62,9 @@ class WebScraper:
         try:
             import sys
             # Add the common directory to Python path
-            logger.debug("Adding common directory to Python path")
-            sys.path.insert(0, '/home/tspires/Development/common')
+            if '/home/tspires/Development/common' not in sys.path:
+                logger.debug("Adding common directory to Python path")
+                sys.path.insert(0, '/home/tspires/Development/common')
             
             # Import scrapers
             logger.debug("Importing scraper classes from common library")
@@ -222,15 +251,7 @@ class WebScraper:
             status_code, html_content, headers = self.requests_scraper.fetch_page(normalized_url)
             
             # Extract text content from HTML
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Get text content
-            content = soup.get_text(separator=' ', strip=True)
+            content = _extract_text(html_content)
             
             # Extract emails from raw HTML
             parsed_url = urlparse(normalized_url)
@@ -298,7 +319,8 @@ class WebScraper:
                 success = len(content) > self.MIN_CONTENT_LENGTH
                 return ScrapedContent(
                     url=normalized_url,
-                    content=content,
+                    # Failed results are discarded downstream; don't carry the text
+                    content=content if success else "",
                     success=success,
                     emails=emails,
                     error=None if success else "Insufficient content"
@@ -418,7 +440,7 @@ class WebScraper:
                              normalized_url, len(content), self.MIN_CONTENT_LENGTH)
                 return ScrapedContent(
                     url=normalized_url,
-                    content=content,
+                    content="",
                     success=False,
                     error=f"Insufficient content scraped (only {len(content)} characters)",
                     emails=emails
@@ -3,18 +3,24 @@
 # Import celery tasks to register them
 from .celery_tasks import (
     scrape_domain,
+    enrich_domain,
     enrich_company,
     enrich_leads,
     export_company_csv,
     export_leads_csv,
+    export_company_csv_batch,
+    export_leads_csv_batch,
     process_domain_pipeline
 )
 
 __all__ = [
     'scrape_domain',
-    'enrich_company', 
+    'enrich_domain',
+    'enrich_company',
     'enrich_leads',
     'export_company_csv',
     'export_leads_csv',
+    'export_company_csv_batch',
+    'export_leads_csv_batch',
     'process_domain_pipeline'
 ]
\ No newline at end of file
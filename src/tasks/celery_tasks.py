@@ -1,14 +1,20 @@
 """Celery tasks for distributed processing."""
 
+import time
 import luigi
 import logging
-from celery import Task
-from typing import Dict, Any
+from celery import Task, chain
+from typing import Dict, Any, List, Optional
 
 from celery_app import app
 from src.tasks.scrape import ScrapeWebsiteTask
-from src.tasks.enrich import EnrichCompanyTask, EnrichLeadsTask
-from src.tasks.export import ExportCompanyCSVTask, ExportLeadsCSVTask
+from src.tasks.enrich import EnrichDomainTask, EnrichCompanyTask, EnrichLeadsTask
+from src.tasks.export import (
+    ExportCompanyCSVTask,
+    ExportLeadsCSVTask,
+    ExportCompanyCSVBatchTask,
+    ExportLeadsCSVBatchTask
+)
 
 logger = logging.getLogger(__name__)
 
@@ -17,146 +23,164 @@ class LuigiCeleryTask(Task):
     """Base Celery task that runs Luigi tasks."""
     
     def run_luigi_task(self, task):
-        """Run a Luigi task and return success status."""
+        """Run a Luigi task and return whether it completed.
+        
+        Incomplete dependencies are run first, in-process, instead of
+        starting a local Luigi scheduler for every Celery task.
+        """
         try:
-            # Run the task
-            result = luigi.build([task], local_scheduler=True, log_level='WARNING')
-            return result
+            if task.complete():
+                return True
+            
+            for dependency in luigi.task.flatten(task.requires()):
+                if not self.run_luigi_task(dependency):
+                    logger.warning(f"Dependency {dependency} did not complete, skipping {task}")
+                    return False
+            
+            task.run()
+            return task.complete()
         except Exception as e:
             logger.error(f"Failed to run Luigi task: {str(e)}")
             raise
+    
+    def run_and_report(
+        self,
+        task,
+        task_name: str,
+        outputs: Optional[Dict[str, str]] = None,
+        **fields
+    ) -> Dict[str, Any]:
+        """Run a Luigi task and build the standard Celery result dict.
+        
+        Args:
+            task: Luigi task to run
+            task_name: Name reported in the result and logs
+            outputs: Result keys mapped to output paths, reported on success
+                (defaults to the task's own output path)
+            **fields: Identifying fields placed first in the result
+        
+        The result also carries the task's run time in seconds as "elapsed".
+        """
+        label = fields.get("domain", fields.get("domains"))
+        logger.info("Starting %s task for %s", task_name, label)
+        
+        if outputs is None:
+            outputs = {"output_path": task.output().path}
+        
+        start = time.monotonic()
+        try:
+            success = self.run_luigi_task(task)
+        except Exception as e:
+            logger.error("%s task failed for %s: %s", task_name, label, e)
+            raise
+        
+        result = dict(fields, task=task_name, success=success, elapsed=time.monotonic() - start)
+        for key, path in outputs.items():
+            result[key] = path if success else None
+        return result
 
 
 @app.task(base=LuigiCeleryTask, bind=True)
 def scrape_domain(self, domain: str) -> Dict[str, Any]:
     """Celery task to scrape a domain."""
-    logger.info(f"Starting scrape task for domain: {domain}")
-    
-    try:
-        task = ScrapeWebsiteTask(domain=domain)
-        success = self.run_luigi_task(task)
-        
-        return {
-            "domain": domain,
-            "task": "scrape",
-            "success": success,
-            "output_path": task.output().path if success else None
-        }
-    except Exception as e:
-        logger.error(f"Scrape task failed for {domain}: {str(e)}")
-        raise
+    return self.run_and_report(ScrapeWebsiteTask(domain=domain), "scrape", domain=domain)
+
+
+@app.task(base=LuigiCeleryTask, bind=True)
+def enrich_domain(self, domain: str) -> Dict[str, Any]:
+    """Celery task to enrich company and lead data in one pass."""
+    task = EnrichDomainTask(domain=domain)
+    outputs = task.output()
+    return self.run_and_report(
+        task,
+        "enrich_domain",
+        outputs={
+            "company_output_path": outputs["company"].path,
+            "leads_output_path": outputs["leads"].path
+        },
+        domain=domain
+    )
 
 
 @app.task(base=LuigiCeleryTask, bind=True)
 def enrich_company(self, domain: str) -> Dict[str, Any]:
     """Celery task to enrich company data."""
-    logger.info(f"Starting company enrichment task for domain: {domain}")
-    
-    try:
-        task = EnrichCompanyTask(domain=domain)
-        success = self.run_luigi_task(task)
-        
-        return {
-            "domain": domain,
-            "task": "enrich_company",
-            "success": success,
-            "output_path": task.output().path if success else None
-        }
-    except Exception as e:
-        logger.error(f"Company enrichment task failed for {domain}: {str(e)}")
-        raise
+    return self.run_and_report(EnrichCompanyTask(domain=domain), "enrich_company", domain=domain)
 
 
 @app.task(base=LuigiCeleryTask, bind=True)
 def enrich_leads(self, domain: str) -> Dict[str, Any]:
     """Celery task to enrich lead data."""
-    logger.info(f"Starting lead enrichment task for domain: {domain}")
-    
-    try:
-        task = EnrichLeadsTask(domain=domain)
-        success = self.run_luigi_task(task)
-        
-        return {
-            "domain": domain,
-            "task": "enrich_leads",
-            "success": success,
-            "output_path": task.output().path if success else None
-        }
-    except Exception as e:
-        logger.error(f"Lead enrichment task failed for {domain}: {str(e)}")
-        raise
+    return self.run_and_report(EnrichLeadsTask(domain=domain), "enrich_leads", domain=domain)
 
 
 @app.task(base=LuigiCeleryTask, bind=True)
 def export_company_csv(self, domain: str, output_file: str) -> Dict[str, Any]:
     """Celery task to export company data to CSV."""
-    logger.info(f"Starting company CSV export for domain: {domain}")
-    
-    try:
-        task = ExportCompanyCSVTask(domain=domain, output_file=output_file)
-        success = self.run_luigi_task(task)
-        
-        return {
-            "domain": domain,
-            "task": "export_company_csv",
-            "success": success,
-            "output_path": output_file if success else None
-        }
-    except Exception as e:
-        logger.error(f"Company CSV export failed for {domain}: {str(e)}")
-        raise
+    return self.run_and_report(
+        ExportCompanyCSVTask(domain=domain, output_file=output_file),
+        "export_company_csv",
+        outputs={"output_path": output_file},
+        domain=domain
+    )
 
 
 @app.task(base=LuigiCeleryTask, bind=True)
 def export_leads_csv(self, domain: str, output_file: str) -> Dict[str, Any]:
     """Celery task to export lead data to CSV."""
-    logger.info(f"Starting leads CSV export for domain: {domain}")
-    
-    try:
-        task = ExportLeadsCSVTask(domain=domain, output_file=output_file)
-        success = self.run_luigi_task(task)
-        
-        return {
-            "domain": domain,
-            "task": "export_leads_csv",
-            "success": success,
-            "output_path": output_file if success else None
-        }
-    except Exception as e:
-        logger.error(f"Leads CSV export failed for {domain}: {str(e)}")
-        raise
+    return self.run_and_report(
+        ExportLeadsCSVTask(domain=domain, output_file=output_file),
+        "export_leads_csv",
+        outputs={"output_path": output_file},
+        domain=domain
+    )
+
+
+@app.task(base=LuigiCeleryTask, bind=True)
+def export_company_csv_batch(self, domains: List[str], output_file: str) -> Dict[str, Any]:
+    """Celery task to export company data for many domains to one CSV."""
+    return self.run_and_report(
+        ExportCompanyCSVBatchTask(domains=domains, output_file=output_file),
+        "export_company_csv_batch",
+        outputs={"output_path": output_file},
+        domains=len(domains)
+    )
+
+
+@app.task(base=LuigiCeleryTask, bind=True)
+def export_leads_csv_batch(self, domains: List[str], output_file: str) -> Dict[str, Any]:
+    """Celery task to export lead data for many domains to one CSV."""
+    return self.run_and_report(
+        ExportLeadsCSVBatchTask(domains=domains, output_file=output_file),
+        "export_leads_csv_batch",
+        outputs={"output_path": output_file},
+        domains=len(domains)
+    )
 
 
 @app.task
 def process_domain_pipeline(domain: str, company_csv: str, leads_csv: str) -> Dict[str, Any]:
-    """Process a complete domain pipeline with all steps."""
+    """Submit the scrape and enrichment steps for a domain as a Celery workflow.
+    
+    Returns immediately with the workflow id; each step runs on whichever
+    worker is free.
+    """
     logger.info(f"Starting complete pipeline for domain: {domain}")
     
     try:
-        # Step 1: Scrape the domain
-        scrape_result = scrape_domain.apply(args=[domain])
-        if not scrape_result.successful():
-            return {
-                "domain": domain,
-                "status": "failed",
-                "step": "scrape",
-                "error": str(scrape_result.result)
-            }
-        
-        # Step 2: Enrich company data
-        company_result = enrich_company.apply(args=[domain])
-        company_success = company_result.successful()
-        
-        # Step 3: Enrich leads data  
-        leads_result = enrich_leads.apply(args=[domain])
-        leads_success = leads_result.successful()
+        # Immutable signatures: the enrich task re-reads the scraped content
+        # from disk via its Luigi requires()/output(), so the scrape result
+        # is not serialized into its arguments.
+        workflow = chain(
+            scrape_domain.si(domain),
+            enrich_domain.si(domain)
+        )
+        result = workflow.apply_async()
         
         return {
             "domain": domain,
-            "status": "completed",
-            "scrape_success": True,
-            "company_enrichment_success": company_success,
-            "leads_enrichment_success": leads_success
+            "status": "submitted",
+            "workflow_id": result.id
         }
         
     except Exception as e:
@@ -165,4 +189,4 @@ def process_domain_pipeline(domain: str, company_csv: str, leads_csv: str) -> Di
             "domain": domain,
             "status": "failed",
             "error": str(e)
-        }
\ No newline at end of file
+        }
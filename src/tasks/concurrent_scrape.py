@@ -1,47 +1,201 @@
 """Concurrent scraping implementation using Celery batch processing."""
 
+import os
+import orjson
+import time
+import asyncio
 import logging
-from typing import List, Dict, Any
-from celery import group
+from functools import partial
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+from celery import chord, group
 from celery_app import app
 from src.tasks.celery_tasks import scrape_domain
+from src.tasks.scrape import ScrapeWebsiteTask
+from src.services.scraper import WebScraper, _extract_text
+from src.models.enrichment import ScrapedContent
 
 logger = logging.getLogger(__name__)
 
 
+BATCH_RESULTS_DIR = Path("data") / "batch_results"
+
+# Target scrape throughput in domains per second; 0 keeps the fixed sizing
+TARGET_QPS = float(os.environ.get('SCRAPE_TARGET_QPS', '0'))
+
+# Weight of each new sample in the scrape latency moving average
+LATENCY_EWMA_ALPHA = 0.2
+
+# Moving average of scrape latency in seconds, None until the first sample
+_lat_ewma: Optional[float] = None
+
+# Fetch homepages for large domain sets over one shared HTTP connection pool.
+# Homepage only: domains scraped this way skip the multi-page crawl.
+BULK_HTTP_SCRAPE = os.environ.get('SCRAPE_BULK_HTTP', '0') == '1'
+BULK_HTTP_CONNECTIONS = 200
+BULK_HTTP_CONNECTIONS_PER_HOST = 4
+BULK_HTTP_DNS_TTL = 300
+
+
+def record_scrape_latency(seconds: float) -> None:
+    """Fold one scrape's latency into the moving average."""
+    global _lat_ewma
+    if _lat_ewma is None:
+        _lat_ewma = seconds
+    else:
+        _lat_ewma += LATENCY_EWMA_ALPHA * (seconds - _lat_ewma)
+
+
+@app.task(name='tasks.aggregate_batch_results')
+def aggregate_batch_results(results: List[Dict[str, Any]], batch_tag: str) -> Dict[str, Any]:
+    """
+    Chord callback that merges the scrape results of one batch.
+    
+    Args:
+        results: Scrape result dicts from the batch's header tasks
+        batch_tag: Identifier for the batch, used for the output file name
+        
+    Returns:
+        Dictionary mapping domains to their scrape results
+    """
+    merged = {result["domain"]: result for result in results}
+    
+    for domain, result in merged.items():
+        logger.info(f"Scraped {domain}: {'success' if result.get('success') else 'failed'}")
+    
+    BATCH_RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    with open(BATCH_RESULTS_DIR / f"{batch_tag}.json", 'wb') as f:
+        f.write(orjson.dumps(merged, option=orjson.OPT_INDENT_2))
+    
+    logger.info(f"Batch {batch_tag} complete. Success rate: {sum(1 for r in merged.values() if r.get('success'))}/{len(merged)}")
+    return merged
+
+
 @app.task(bind=True, name='tasks.batch_scrape_domains')
 def batch_scrape_domains(self, domains: List[str], batch_size: int = 10) -> Dict[str, Any]:
     """
     Scrape multiple domains concurrently using Celery.
     
+    Each batch is submitted as a chord whose callback merges the results,
+    so this task returns immediately instead of blocking a worker on
+    subtask results.
+    
     Args:
         domains: List of domains to scrape
-        batch_size: Number of domains to process concurrently
+        batch_size: Number of domains per aggregated batch
         
     Returns:
-        Dictionary mapping domains to their scrape results
+        Dictionary with the chord id and domains of each submitted batch
     """
     logger.info(f"Starting batch scrape of {len(domains)} domains in batches of {batch_size}")
     
-    results = {}
+    run_id = self.request.id or "local"
+    batches = []
     
-    # Process domains in batches
     for i in range(0, len(domains), batch_size):
         batch = domains[i:i + batch_size]
-        logger.info(f"Processing batch {i//batch_size + 1}: {len(batch)} domains")
-        
-        # Create a group of scraping tasks
-        job = group(scrape_domain.s(domain) for domain in batch)
+        batch_tag = f"{run_id}_{i//batch_size + 1}"
+        logger.info(f"Submitting batch {i//batch_size + 1}: {len(batch)} domains")
         
-        # Execute the group and wait for results
-        batch_results = job.apply_async().get(timeout=300)  # 5 minute timeout
-        
-        # Map results back to domains
-        for domain, result in zip(batch, batch_results):
-            results[domain] = result
-            logger.info(f"Scraped {domain}: {'success' if result.get('success') else 'failed'}")
+        header = [scrape_domain.s(domain) for domain in batch]
+        result = chord(header)(aggregate_batch_results.s(batch_tag=batch_tag))
+        batches.append({"batch_tag": batch_tag, "chord_id": result.id, "domains": batch})
     
-    logger.info(f"Batch scraping complete. Success rate: {sum(1 for r in results.values() if r.get('success'))}/{len(domains)}")
+    return {"total_domains": len(domains), "batches": batches}
+
+
+def _save_homepage(scraper: WebScraper, domain: str, url: str, html_content: str) -> Optional[str]:
+    """Extract a fetched homepage and save it as the domain's scrape output.
+    
+    Runs in an executor thread, keeping parsing and file IO off the event
+    loop. Returns the output path, or None when the page has too little text.
+    """
+    content = _extract_text(html_content)
+    if len(content) <= WebScraper.MIN_CONTENT_LENGTH:
+        logger.info("Bulk fetch returned insufficient content for %s", domain)
+        return None
+    
+    scraped_content = ScrapedContent(
+        url=url,
+        content=content,
+        success=True,
+        emails=scraper.extract_emails_from_html(html_content, domain),
+        error=None
+    )
+    task = ScrapeWebsiteTask(domain=domain)
+    task._save_output(task._prepare_output_data(scraped_content))
+    return task.output().path
+
+
+async def _async_scrape_one(session, scraper: WebScraper, domain: str) -> Optional[Dict[str, Any]]:
+    """Fetch a domain's homepage and save it as the domain's scrape output.
+    
+    Returns None when the page could not be fetched or has too little text,
+    leaving the domain to the browser-capable scrape task.
+    """
+    start = time.monotonic()
+    try:
+        async with session.get(f"https://{domain}") as response:
+            response.raise_for_status()
+            url = str(response.url)
+            html_content = await response.text()
+    except Exception as e:
+        logger.info("Bulk fetch failed for %s: %s", domain, e)
+        return None
+    
+    loop = asyncio.get_running_loop()
+    output_path = await loop.run_in_executor(
+        None, _save_homepage, scraper, domain, url, html_content
+    )
+    if output_path is None:
+        return None
+    
+    return {
+        "domain": domain,
+        "task": "scrape",
+        "success": True,
+        "elapsed": time.monotonic() - start,
+        "output_path": output_path
+    }
+
+
+async def _async_scrape_all(domains: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch all domains concurrently, sharing connections and DNS lookups."""
+    import aiohttp
+    
+    # One scraper serves every domain; it is built off the event loop
+    loop = asyncio.get_running_loop()
+    scraper = await loop.run_in_executor(None, partial(WebScraper, use_browser_pool=False))
+    connector = aiohttp.TCPConnector(
+        limit=BULK_HTTP_CONNECTIONS,
+        limit_per_host=BULK_HTTP_CONNECTIONS_PER_HOST,
+        ttl_dns_cache=BULK_HTTP_DNS_TTL
+    )
+    timeout = aiohttp.ClientTimeout(total=WebScraper.SCRAPER_TIMEOUT)
+    
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        results = await asyncio.gather(
+            *(_async_scrape_one(session, scraper, domain) for domain in domains)
+        )
+    
+    return {result["domain"]: result for result in results if result}
+
+
+@app.task(name='tasks.bulk_scrape_async')
+def bulk_scrape_async(domains: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Scrape domain homepages from one worker over a shared connection pool.
+    
+    Args:
+        domains: List of domains to scrape
+        
+    Returns:
+        Scrape results for the domains that were scraped; domains that need
+        a browser (or failed) are omitted
+    """
+    logger.info(f"Starting bulk HTTP scrape of {len(domains)} domains")
+    results = asyncio.run(_async_scrape_all(domains))
+    logger.info(f"Bulk HTTP scrape covered {len(results)}/{len(domains)} domains")
     return results
 
 
@@ -53,6 +207,10 @@ class ConcurrentScrapingStrategy:
         """
         Estimate optimal batch size based on domains and workers.
         
+        With SCRAPE_TARGET_QPS set and latency measured, the batch is sized
+        as the in-flight window target_qps * latency. Otherwise it falls
+        back to brackets on the number of domains.
+        
         Args:
             num_domains: Total number of domains to scrape
             available_workers: Number of Celery workers available
@@ -60,6 +218,9 @@ class ConcurrentScrapingStrategy:
         Returns:
             Optimal batch size
         """
+        if TARGET_QPS > 0 and _lat_ewma is not None:
+            return max(2, min(num_domains, int(TARGET_QPS * _lat_ewma)))
+        
         # Base batch size on available workers
         base_batch = available_workers * 2  # Allow some queueing
         
@@ -102,14 +263,36 @@ def scrape_domains_optimized(domains: List[str]) -> Dict[str, Any]:
     strategy = ConcurrentScrapingStrategy()
     
     if strategy.should_use_concurrent(len(domains)):
+        results = {}
+        
+        # Plain HTTP first; only what it could not handle fans out to Celery
+        if BULK_HTTP_SCRAPE:
+            results.update(bulk_scrape_async.delay(domains).get())
+            for result in results.values():
+                record_scrape_latency(result["elapsed"])
+            domains = [domain for domain in domains if domain not in results]
+            if not domains:
+                return results
+        
         # Use concurrent scraping
         batch_size = strategy.estimate_optimal_batch_size(len(domains))
         logger.info(f"Using concurrent scraping with batch size {batch_size}")
-        return batch_scrape_domains.delay(domains, batch_size).get()
+        
+        def collect(task_id, result):
+            results[result["domain"]] = result
+            record_scrape_latency(result["elapsed"])
+        
+        # batch_size is the in-flight window: each window's scrapes run in
+        # parallel as a group and are collected as they finish
+        for i in range(0, len(domains), batch_size):
+            window = domains[i:i + batch_size]
+            group(scrape_domain.s(domain) for domain in window).apply_async().join_native(callback=collect)
+        return results
     else:
         # Use sequential scraping for small sets
         logger.info("Using sequential scraping for small domain set")
         results = {}
         for domain in domains:
             results[domain] = scrape_domain.delay(domain).get()
+            record_scrape_latency(results[domain]["elapsed"])
         return results
\ No newline at end of file
@@ -1,11 +1,13 @@
 """Luigi task for AI enrichment."""
 
-import json
+import re
 import luigi
+import orjson
 import logging
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 
 from src.tasks.base import BaseTask
 from src.tasks.scrape import ScrapeWebsiteTask
@@ -14,221 +16,235 @@ from src.models.enrichment import ScrapedContent
 
 logger = logging.getLogger(__name__)
 
+# Name separators in an email local part, in priority order
+_NAME_SEPARATORS = ('.', '_', '-')
+_NAME_SEPARATOR_RE = re.compile(r'[._-]')
 
-class EnrichCompanyTask(BaseTask):
-    """Task to enrich company data using AI analysis."""
+# Analyzer shared by all tasks in a Celery worker process (see init_analyzer)
+_ANALYZER: Optional[AIAnalyzer] = None
+
+
+def init_analyzer() -> None:
+    """Create the process-wide analyzer; called once per Celery worker process."""
+    global _ANALYZER
+    _ANALYZER = AIAnalyzer()
+
+
+@lru_cache(maxsize=4096)
+def _parse_email_local(local_part: str) -> Tuple[str, str]:
+    """Split an email local part into first and last name.
+    
+    Cached because local parts like info or sales repeat across domains.
+    """
+    # Split on the highest-priority separator present, if any
+    if _NAME_SEPARATOR_RE.search(local_part):
+        separator = next(sep for sep in _NAME_SEPARATORS if sep in local_part)
+        parts = local_part.split(separator)
+        return parts[0].title(), parts[-1].title()
+    
+    # Default: use local part as first name
+    return local_part.title(), ""
+
+
+class EnrichDomainTask(BaseTask):
+    """Task to enrich company and lead data from one read of the scraped content."""
+    
+    _analyzer: Optional[AIAnalyzer] = None
     
     def requires(self):
         """This task requires scraped content."""
         return ScrapeWebsiteTask(domain=self.domain)
     
     def output(self):
-        """Define output target."""
-        output_path = self.get_output_path("enriched_companies", "json")
-        return luigi.LocalTarget(str(output_path))
+        """Define output targets for company and lead data."""
+        return {
+            "company": luigi.LocalTarget(str(self.get_output_path("enriched_companies", "json"))),
+            "leads": luigi.LocalTarget(str(self.get_output_path("enriched_leads", "json")))
+        }
     
     def run(self):
-        """Execute the enrichment task."""
-        logger.info(f"Starting company enrichment task for domain: {self.domain}")
+        """Execute company and lead enrichment."""
+        logger.info(f"Starting enrichment task for domain: {self.domain}")
+        outputs = self.output()
         
         try:
-            # Read scraped content
-            with open(self.input().path, 'r') as f:
-                scraped_data = json.load(f)
-            
-            # Check if scraping was successful
-            if not scraped_data.get('success', False):
-                logger.warning(f"Skipping enrichment for {self.domain} - scraping failed")
-                # Create minimal output
-                output_data = {
-                    "domain": self.domain,
-                    "enriched_at": datetime.now().isoformat(),
-                    "success": False,
-                    "error": f"Scraping failed: {scraped_data.get('error', 'Unknown error')}",
-                    "analysis": None
-                }
-            else:
-                # Initialize analyzer
-                analyzer = AIAnalyzer()
-                
-                # Create scraped content object
-                scraped_content = ScrapedContent(
-                    url=scraped_data['url'],
-                    content=scraped_data['content'],
-                    success=True,
-                    emails=scraped_data.get('emails', [])
-                )
-                
-                # Analyze company with domain and emails context
-                analysis = analyzer.analyze_company(
-                    scraped_content.content, 
-                    domain=self.domain, 
-                    emails=scraped_content.emails
-                )
-                
-                # Prepare output data
-                output_data = {
-                    "domain": self.domain,
-                    "enriched_at": datetime.now().isoformat(),
-                    "success": True,
-                    "scraped_url": scraped_data['url'],
-                    "emails_found": scraped_data.get('emails', []),
-                    "analysis": analysis.to_dict() if analysis else None
-                }
-            
-            # Ensure output directory exists
-            output_path = Path(self.output().path)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Write to file
-            with open(output_path, 'w') as f:
-                json.dump(output_data, f, indent=2)
-            
+            # Read scraped content once for both analyses
+            with open(self.input().path, 'rb') as f:
+                scraped_data = orjson.loads(f.read())
+        except Exception as e:
+            logger.error(f"Failed to read scraped content for {self.domain}: {str(e)}")
+            # Still create output files to mark task as complete
+            self._write_output(outputs["company"], self._error_output(str(e), analysis=None))
+            self._write_output(outputs["leads"], self._error_output(str(e), leads=[]))
+            return
+        
+        try:
+            company_data = self._enrich_company(scraped_data)
             logger.info(f"Successfully enriched company data for {self.domain}")
-            
         except Exception as e:
             logger.error(f"Failed to enrich {self.domain}: {str(e)}")
-            # Still create output file to mark task as complete
-            output_data = {
-                "domain": self.domain,
-                "enriched_at": datetime.now().isoformat(),
-                "success": False,
-                "error": str(e),
-                "analysis": None
-            }
-            
-            output_path = Path(self.output().path)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(output_path, 'w') as f:
-                json.dump(output_data, f, indent=2)
-
-
-class EnrichLeadsTask(BaseTask):
-    """Task to enrich lead data from scraped emails."""
-    
-    def requires(self):
-        """This task requires scraped content."""
-        return ScrapeWebsiteTask(domain=self.domain)
-    
-    def output(self):
-        """Define output target."""
-        output_path = self.get_output_path("enriched_leads", "json")
-        return luigi.LocalTarget(str(output_path))
-    
-    def run(self):
-        """Execute the lead enrichment task."""
-        logger.info(f"Starting lead enrichment task for domain: {self.domain}")
+            company_data = self._error_output(str(e), analysis=None)
+        self._write_output(outputs["company"], company_data)
         
         try:
-            # Read scraped content
-            with open(self.input().path, 'r') as f:
-                scraped_data = json.load(f)
-            
-            # Check if we have emails
-            emails = scraped_data.get('emails', [])
-            if not emails:
-                logger.info(f"No emails found for {self.domain}, creating empty lead file")
-                output_data = {
-                    "domain": self.domain,
-                    "enriched_at": datetime.now().isoformat(),
-                    "success": True,
-                    "leads": []
-                }
-            else:
-                # Initialize analyzer
-                analyzer = AIAnalyzer()
-                
-                # Create scraped content object
-                scraped_content = ScrapedContent(
-                    url=scraped_data['url'],
-                    content=scraped_data['content'],
-                    success=True,
-                    emails=emails
-                )
-                
-                # Analyze leads
-                leads = []
-                for email in emails:
-                    try:
-                        lead_data = self._parse_email(email)
-                        
-                        # Analyze lead if we have content
-                        if scraped_data.get('success', False) and scraped_data.get('content'):
-                            lead_info = {
-                                "firstname": lead_data.get('first_name', ''),
-                                "lastname": lead_data.get('last_name', ''),
-                                "email": email,
-                                "company": self.domain
-                            }
-                            analysis = analyzer.analyze_lead(scraped_content.content, lead_info)
-                            lead_data['analysis'] = analysis.to_dict() if analysis else None
-                        else:
-                            lead_data['analysis'] = None
-                        
-                        leads.append(lead_data)
-                    except Exception as e:
-                        logger.error(f"Failed to process lead {email}: {str(e)}")
-                        leads.append({
-                            "email": email,
-                            "first_name": "",
-                            "last_name": "",
-                            "error": str(e),
-                            "analysis": None
-                        })
-                
-                output_data = {
-                    "domain": self.domain,
-                    "enriched_at": datetime.now().isoformat(),
-                    "success": True,
-                    "leads": leads
-                }
-            
-            # Ensure output directory exists
-            output_path = Path(self.output().path)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Write to file
-            with open(output_path, 'w') as f:
-                json.dump(output_data, f, indent=2)
-            
-            logger.info(f"Successfully enriched {len(output_data['leads'])} leads for {self.domain}")
-            
+            leads_data = self._enrich_leads(scraped_data)
+            logger.info(f"Successfully enriched {len(leads_data['leads'])} leads for {self.domain}")
         except Exception as e:
             logger.error(f"Failed to enrich leads for {self.domain}: {str(e)}")
-            # Still create output file to mark task as complete
-            output_data = {
+            leads_data = self._error_output(str(e), leads=[])
+        self._write_output(outputs["leads"], leads_data)
+    
+    def _get_analyzer(self) -> AIAnalyzer:
+        """Get the worker's shared analyzer, or one created for this task."""
+        if self._analyzer is None:
+            self._analyzer = _ANALYZER or AIAnalyzer()
+        return self._analyzer
+    
+    def _error_output(self, error: str, **empty_fields) -> Dict[str, Any]:
+        """Build the output written when enrichment fails."""
+        return {
+            "domain": self.domain,
+            "enriched_at": datetime.now().isoformat(),
+            "success": False,
+            "error": error,
+            **empty_fields
+        }
+    
+    def _write_output(self, target: luigi.LocalTarget, output_data: Dict[str, Any]) -> None:
+        """Write output data to a target file."""
+        output_path = Path(target.path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(output_data, option=orjson.OPT_INDENT_2))
+    
+    def _enrich_company(self, scraped_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build company output data from scraped content."""
+        # Check if scraping was successful
+        if not scraped_data.get('success', False):
+            logger.warning(f"Skipping enrichment for {self.domain} - scraping failed")
+            return self._error_output(
+                f"Scraping failed: {scraped_data.get('error', 'Unknown error')}",
+                analysis=None
+            )
+        
+        # Create scraped content object
+        scraped_content = ScrapedContent(
+            url=scraped_data['url'],
+            content=scraped_data['content'],
+            success=True,
+            emails=scraped_data.get('emails', [])
+        )
+        
+        # Analyze company with domain and emails context
+        analysis = self._get_analyzer().analyze_company(
+            scraped_content.content, 
+            domain=self.domain, 
+            emails=scraped_content.emails
+        )
+        
+        return {
+            "domain": self.domain,
+            "enriched_at": datetime.now().isoformat(),
+            "success": True,
+            "scraped_url": scraped_data['url'],
+            "emails_found": scraped_data.get('emails', []),
+            "analysis": analysis.to_dict() if analysis else None
+        }
+    
+    def _enrich_leads(self, scraped_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build lead output data from scraped emails."""
+        # Check if we have emails
+        emails = scraped_data.get('emails', [])
+        if not emails:
+            logger.info(f"No emails found for {self.domain}, creating empty lead file")
+            return {
                 "domain": self.domain,
                 "enriched_at": datetime.now().isoformat(),
-                "success": False,
-                "error": str(e),
+                "success": True,
                 "leads": []
             }
-            
-            output_path = Path(self.output().path)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(output_path, 'w') as f:
-                json.dump(output_data, f, indent=2)
-    
-    def _parse_email(self, email: str) -> Dict[str, Any]:
-        """Parse email to extract first and last name."""
-        local_part = email.split('@')[0]
         
-        # Try to split by common separators
-        for separator in ['.', '_', '-']:
-            if separator in local_part:
-                parts = local_part.split(separator)
-                if len(parts) >= 2:
-                    return {
+        # Parse leads, collecting the ones to analyze
+        leads = []
+        pending = []
+        has_content = scraped_data.get('success', False) and scraped_data.get('content')
+        for email in emails:
+            try:
+                lead_data = self._parse_email(email)
+                lead_data['analysis'] = None
+                
+                if has_content:
+                    lead_info = {
+                        "firstname": lead_data.get('first_name', ''),
+                        "lastname": lead_data.get('last_name', ''),
                         "email": email,
-                        "first_name": parts[0].title(),
-                        "last_name": parts[-1].title()
+                        "company": self.domain
                     }
+                    pending.append((lead_data, lead_info))
+                
+                leads.append(lead_data)
+            except Exception as e:
+                logger.error(f"Failed to process lead {email}: {str(e)}")
+                leads.append({
+                    "email": email,
+                    "first_name": "",
+                    "last_name": "",
+                    "error": str(e),
+                    "analysis": None
+                })
+        
+        # Analyze all leads in as few requests as possible
+        if pending:
+            analyses = self._get_analyzer().analyze_leads_batch(
+                scraped_data['content'],
+                [lead_info for _, lead_info in pending]
+            )
+            for (lead_data, _), analysis in zip(pending, analyses):
+                lead_data['analysis'] = analysis.to_dict() if analysis else None
         
-        # Default: use local part as first name
+        return {
+            "domain": self.domain,
+            "enriched_at": datetime.now().isoformat(),
+            "success": True,
+            "leads": leads
+        }
+    
+    def _parse_email(self, email: str) -> Dict[str, Any]:
+        """Parse email to extract first and last name."""
+        first_name, last_name = _parse_email_local(email.split('@', 1)[0])
         return {
             "email": email,
-            "first_name": local_part.title(),
-            "last_name": ""
-        }
\ No newline at end of file
+            "first_name": first_name,
+            "last_name": last_name
+        }
+
+
+class EnrichCompanyTask(BaseTask):
+    """Company enrichment output, produced by EnrichDomainTask."""
+    
+    def requires(self):
+        """This task requires the combined domain enrichment."""
+        return EnrichDomainTask(domain=self.domain)
+    
+    def output(self):
+        """Define output target."""
+        return self.requires().output()["company"]
+    
+    def run(self):
+        """Nothing to do - EnrichDomainTask writes the output."""
+
+
+class EnrichLeadsTask(BaseTask):
+    """Lead enrichment output, produced by EnrichDomainTask."""
+    
+    def requires(self):
+        """This task requires the combined domain enrichment."""
+        return EnrichDomainTask(domain=self.domain)
+    
+    def output(self):
+        """Define output target."""
+        return self.requires().output()["leads"]
+    
+    def run(self):
+        """Nothing to do - EnrichDomainTask writes the output."""
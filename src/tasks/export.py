@@ -1,18 +1,77 @@
 """Luigi task for CSV export."""
 
-import json
 import csv
+import fcntl
+import itertools
+import os
 import luigi
+import orjson
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, Iterator, Tuple
 
 from src.tasks.base import BaseTask
 from src.tasks.enrich import EnrichCompanyTask, EnrichLeadsTask
 
 logger = logging.getLogger(__name__)
 
+# Threads used to overlap input-file reads in the batch export tasks
+READ_WORKERS = 8
+
+# CSV columns, in the order the row builders produce them
+COMPANY_FIELDNAMES = (
+    "domain", "enriched_at", "success", "error", "scraped_url",
+    "emails_found", "business_type", "naics_code", "target_market",
+    "products_services", "value_propositions", "competitive_advantages",
+    "technologies", "certifications", "pain_points", "confidence_score"
+)
+LEAD_FIELDNAMES = (
+    "email", "first_name", "last_name", "company_domain",
+    "enriched_at", "error", "buyer_persona", "lead_score_adjustment"
+)
+
+
+@contextmanager
+def _locked_append(path: Path):
+    """Open a CSV for appending under an exclusive lock.
+    
+    Yields the file and whether it is empty (header needed). The size is
+    checked after the lock is taken, so concurrent workers appending to
+    the same file write exactly one header and never interleave rows.
+    """
+    with open(path, 'a', newline='', encoding='utf-8') as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield f, f.seek(0, os.SEEK_END) == 0
+            f.flush()
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _iter_json_files(paths: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Parse JSON files in order, reading them concurrently in a thread pool.
+    
+    Only a window of reads is in flight at a time, so at most that many
+    files are held in memory however many paths there are.
+    """
+    paths = iter(paths)
+    window = 2 * READ_WORKERS
+    with ThreadPoolExecutor(max_workers=READ_WORKERS) as executor:
+        pending = deque(
+            executor.submit(Path(path).read_bytes)
+            for path in itertools.islice(paths, window)
+        )
+        while pending:
+            data = pending.popleft().result()
+            # Top up the window before parsing, keeping the readers busy
+            for path in itertools.islice(paths, 1):
+                pending.append(executor.submit(Path(path).read_bytes))
+            yield orjson.loads(data)
+
 
 class ExportCompanyCSVTask(BaseTask):
     """Task to export enriched company data to CSV."""
@@ -33,8 +92,8 @@ class ExportCompanyCSVTask(BaseTask):
         
         try:
             # Read enriched data
-            with open(self.input().path, 'r') as f:
-                enriched_data = json.load(f)
+            with open(self.input().path, 'rb') as f:
+                enriched_data = orjson.loads(f.read())
             
             # Prepare CSV row
             row = self._prepare_company_row(enriched_data)
@@ -43,16 +102,12 @@ class ExportCompanyCSVTask(BaseTask):
             output_path = Path(self.output().path)
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Check if file exists to write header
-            file_exists = output_path.exists()
-            
-            with open(output_path, 'a', newline='', encoding='utf-8') as f:
-                fieldnames = self._get_company_fieldnames()
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
+            with _locked_append(output_path) as (f, is_empty):
+                writer = csv.writer(f)
                 
                 # Write header if file is new
-                if not file_exists:
-                    writer.writeheader()
+                if is_empty:
+                    writer.writerow(COMPANY_FIELDNAMES)
                 
                 writer.writerow(row)
             
@@ -62,57 +117,29 @@ class ExportCompanyCSVTask(BaseTask):
             logger.error(f"Failed to export company CSV for {self.domain}: {str(e)}")
             raise
     
-    def _prepare_company_row(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Prepare a row for CSV export."""
-        row = {
-            "domain": data.get("domain", ""),
-            "enriched_at": data.get("enriched_at", ""),
-            "success": data.get("success", False),
-            "error": data.get("error", ""),
-            "scraped_url": data.get("scraped_url", ""),
-            "emails_found": ";".join(data.get("emails_found", []))
-        }
-        
-        # Add analysis fields if available
-        if data.get("analysis"):
-            analysis = data["analysis"]
-            row.update({
-                "business_type": analysis.get("business_type_description", ""),
-                "naics_code": analysis.get("naics_code", ""),
-                "target_market": analysis.get("target_market", ""),
-                "products_services": ";".join(analysis.get("primary_products_services", [])),
-                "value_propositions": ";".join(analysis.get("value_propositions", [])),
-                "competitive_advantages": ";".join(analysis.get("competitive_advantages", [])),
-                "technologies": ";".join(analysis.get("technologies_used", [])),
-                "certifications": ";".join(analysis.get("certifications_awards", [])),
-                "pain_points": ";".join(analysis.get("pain_points_addressed", [])),
-                "confidence_score": analysis.get("confidence_score", 0)
-            })
-        else:
-            # Add empty fields
-            row.update({
-                "business_type": "",
-                "naics_code": "",
-                "target_market": "",
-                "products_services": "",
-                "value_propositions": "",
-                "competitive_advantages": "",
-                "technologies": "",
-                "certifications": "",
-                "pain_points": "",
-                "confidence_score": 0
-            })
-        
-        return row
-    
-    def _get_company_fieldnames(self) -> List[str]:
-        """Get fieldnames for company CSV."""
-        return [
-            "domain", "enriched_at", "success", "error", "scraped_url",
-            "emails_found", "business_type", "naics_code", "target_market",
-            "products_services", "value_propositions", "competitive_advantages",
-            "technologies", "certifications", "pain_points", "confidence_score"
-        ]
+    @staticmethod
+    def _prepare_company_row(data: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Prepare a row for CSV export, in COMPANY_FIELDNAMES order."""
+        # Missing analysis falls through to the empty defaults below
+        analysis = data.get("analysis") or {}
+        return (
+            data.get("domain", ""),
+            data.get("enriched_at", ""),
+            data.get("success", False),
+            data.get("error", ""),
+            data.get("scraped_url", ""),
+            ";".join(data.get("emails_found", [])),
+            analysis.get("business_type_description", ""),
+            analysis.get("naics_code", ""),
+            analysis.get("target_market", ""),
+            ";".join(analysis.get("primary_products_services", [])),
+            ";".join(analysis.get("value_propositions", [])),
+            ";".join(analysis.get("competitive_advantages", [])),
+            ";".join(analysis.get("technologies_used", [])),
+            ";".join(analysis.get("certifications_awards", [])),
+            ";".join(analysis.get("pain_points_addressed", [])),
+            analysis.get("confidence_score", 0)
+        )
 
 
 class ExportLeadsCSVTask(BaseTask):
@@ -134,8 +161,8 @@ class ExportLeadsCSVTask(BaseTask):
         
         try:
             # Read enriched data
-            with open(self.input().path, 'r') as f:
-                enriched_data = json.load(f)
+            with open(self.input().path, 'rb') as f:
+                enriched_data = orjson.loads(f.read())
             
             # Skip if no leads
             leads = enriched_data.get("leads", [])
@@ -152,15 +179,11 @@ class ExportLeadsCSVTask(BaseTask):
             output_path = Path(self.output().path)
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Check if file exists to write header
-            file_exists = output_path.exists()
-            
-            with open(output_path, 'a', newline='', encoding='utf-8') as f:
-                fieldnames = self._get_lead_fieldnames()
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
+            with _locked_append(output_path) as (f, is_empty):
+                writer = csv.DictWriter(f, fieldnames=LEAD_FIELDNAMES)
                 
                 # Write header if file is new
-                if not file_exists:
+                if is_empty:
                     writer.writeheader()
                 
                 writer.writerows(rows)
@@ -171,7 +194,8 @@ class ExportLeadsCSVTask(BaseTask):
             logger.error(f"Failed to export leads CSV for {self.domain}: {str(e)}")
             raise
     
-    def _prepare_lead_row(self, lead: Dict[str, Any], enriched_data: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _prepare_lead_row(lead: Dict[str, Any], enriched_data: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare a row for CSV export."""
         row = {
             "email": lead.get("email", ""),
@@ -196,13 +220,97 @@ class ExportLeadsCSVTask(BaseTask):
             })
         
         return row
+
+
+class ExportCompanyCSVBatchTask(luigi.Task):
+    """Task to export enriched company data for many domains to one CSV."""
     
-    def _get_lead_fieldnames(self) -> List[str]:
-        """Get fieldnames for lead CSV."""
-        return [
-            "email", "first_name", "last_name", "company_domain",
-            "enriched_at", "error", "buyer_persona", "lead_score_adjustment"
-        ]
+    domains = luigi.ListParameter()
+    output_file = luigi.Parameter()
+    
+    # Rows buffered before each writerows call
+    WRITE_BLOCK_SIZE = 1000
+    
+    def requires(self):
+        """This task requires enriched company data for every domain."""
+        return [EnrichCompanyTask(domain=domain) for domain in self.domains]
+    
+    def output(self):
+        """Define output target."""
+        return luigi.LocalTarget(str(self.output_file))
+    
+    def run(self):
+        """Write the header once, then all company rows."""
+        logger.info(f"Starting company CSV export for {len(self.domains)} domains")
+        
+        output_path = Path(self.output().path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        written = 0
+        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(COMPANY_FIELDNAMES)
+            
+            rows = []
+            for enriched_data in _iter_json_files(target.path for target in self.input()):
+                rows.append(ExportCompanyCSVTask._prepare_company_row(enriched_data))
+                
+                if len(rows) >= self.WRITE_BLOCK_SIZE:
+                    writer.writerows(rows)
+                    written += len(rows)
+                    rows = []
+            
+            writer.writerows(rows)
+            written += len(rows)
+        
+        logger.info(f"Exported {written} companies to {output_path}")
+
+
+class ExportLeadsCSVBatchTask(luigi.Task):
+    """Task to export enriched lead data for many domains to one CSV."""
+    
+    domains = luigi.ListParameter()
+    output_file = luigi.Parameter()
+    
+    # Rows buffered before each writerows call
+    WRITE_BLOCK_SIZE = 1000
+    
+    def requires(self):
+        """This task requires enriched lead data for every domain."""
+        return [EnrichLeadsTask(domain=domain) for domain in self.domains]
+    
+    def output(self):
+        """Define output target."""
+        return luigi.LocalTarget(str(self.output_file))
+    
+    def run(self):
+        """Write the header once, then all lead rows."""
+        logger.info(f"Starting leads CSV export for {len(self.domains)} domains")
+        
+        output_path = Path(self.output().path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        written = 0
+        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=LEAD_FIELDNAMES)
+            writer.writeheader()
+            
+            rows = []
+            for enriched_data in _iter_json_files(target.path for target in self.input()):
+                rows.extend(
+                    ExportLeadsCSVTask._prepare_lead_row(lead, enriched_data)
+                    for lead in enriched_data.get("leads", [])
+                )
+                
+                if len(rows) >= self.WRITE_BLOCK_SIZE:
+                    writer.writerows(rows)
+                    written += len(rows)
+                    rows = []
+            
+            writer.writerows(rows)
+            written += len(rows)
+        
+        logger.info(f"Exported {written} leads to {output_path}")
 
 
 class ExportAllCSVTask(luigi.Task):
@@ -1,10 +1,12 @@
 """Luigi task for web scraping."""
 
-import json
+import os
 import luigi
+import orjson
 import logging
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Any
 
 from src.tasks.base import BaseTask
@@ -15,6 +17,29 @@ from src.constants import ProcessingConfig
 
 logger = logging.getLogger(__name__)
 
+# Scrape output is compact unless SCRAPE_OUTPUT_INDENT is set for debugging
+OUTPUT_DUMP_OPTION = orjson.OPT_INDENT_2 if os.environ.get("SCRAPE_OUTPUT_INDENT") else 0
+
+
+@lru_cache(maxsize=4)
+def _get_multi_page_scraper(max_depth: int) -> MultiPageScraper:
+    """Get the process-wide multi-page scraper for a depth.
+    
+    Scraper setup builds a Selenium fallback and a requests session, so
+    one instance is reused for every domain scraped in the process.
+    """
+    return MultiPageScraper(use_browser_pool=False, max_depth=max_depth)
+
+
+@lru_cache(maxsize=4)
+def _get_web_scraper(scraper_class: type) -> WebScraper:
+    """Get the process-wide single-page scraper built by ``scraper_class``.
+    
+    Like the multi-page scraper, one instance is reused for every domain
+    rather than rebuilding its Selenium and requests scrapers per task.
+    """
+    return scraper_class()
+
 
 class ScrapeWebsiteTask(BaseTask):
     """Task to scrape a website and save content to file."""
@@ -46,7 +71,7 @@ class ScrapeWebsiteTask(BaseTask):
         # Use multi-page scraper if depth > 0
         if self.scraping_depth > 0:
             logger.info(f"Using multi-page scraper with depth={self.scraping_depth}")
-            scraper = MultiPageScraper(use_browser_pool=False, max_depth=self.scraping_depth)
+            scraper = _get_multi_page_scraper(self.scraping_depth)
             
             # Scrape multiple pages
             scraped_pages = scraper.scrape_domain_multi_page(self.domain, max_pages=10)
@@ -55,7 +80,7 @@ class ScrapeWebsiteTask(BaseTask):
             return scraper.create_combined_content(scraped_pages)
         else:
             logger.info("Using single-page scraper")
-            scraper = WebScraper()
+            scraper = _get_web_scraper(WebScraper)
             return scraper.scrape_domain(self.domain)
     
     def _prepare_output_data(self, scraped_content) -> dict:
@@ -75,8 +100,8 @@ class ScrapeWebsiteTask(BaseTask):
         output_path = Path(self.output().path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, 'w') as f:
-            json.dump(output_data, f, indent=2)
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(output_data, option=OUTPUT_DUMP_OPTION))
     
     def _save_error_output(self, error_message: str):
         """Save error output to mark task as complete."""
@@ -3,8 +3,10 @@
 import csv
 import logging
 import os
+import sys
 import threading
-from typing import Dict, List, Any, Set
+import time
+from typing import Dict, List, Any, Set, Tuple
 
 from src.constants import (
     HUBSPOT_NAME_LIMIT,
@@ -12,7 +14,8 @@ from src.constants import (
     HUBSPOT_STANDARD_FIELD_LIMIT,
     HUBSPOT_POSTAL_CODE_LIMIT,
     HUBSPOT_NAICS_CODE_LIMIT,
-    ENRICHMENT_STATUS_COMPLETED
+    ENRICHMENT_STATUS_COMPLETED,
+    ExportConfig
 )
 
 logger = logging.getLogger(__name__)
@@ -21,181 +24,187 @@ logger = logging.getLogger(__name__)
 class CSVExporter:
     """Export enriched company data to CSV format for HubSpot import."""
     
+    # Every column _build_csv_row can produce, in output order
+    _BASE_FIELDNAMES: Tuple[str, ...] = (
+        # Required fields
+        "Company Domain Name",
+        "Name",
+        
+        # Standard HubSpot fields
+        "Company Description",
+        "Industry",
+        "City",
+        "State/Region",
+        "Postal Code",
+        "Country",
+        "Timezone",
+        "Number of Employees",
+        "Annual Revenue",
+        
+        # Custom fields
+        "Business Type Description",
+        "NAICS Code",
+        "Target Market",
+        "Primary Products Services",
+        "Value Propositions",
+        "Competitive Advantages",
+        "Technologies Used",
+        "Certifications Awards",
+        "Pain Points Addressed",
+        "Confidence Score",
+        
+        # Metadata fields
+        "Enrichment Status",
+        "Site Content",
+        "Enrichment Error"
+    )
+    
+    # Columns the batch export puts first, when filled
+    _PRIORITY_FIELDS: Tuple[str, ...] = ("Company Domain Name", "Name")
+    
+    # (CSV column, company data key, length limit) for plain text fields
+    _FIELD_SPEC: Tuple[Tuple[str, str, int], ...] = (
+        # Standard HubSpot fields
+        ("Company Description", "company_summary", HUBSPOT_DESCRIPTION_LIMIT),
+        ("Industry", "industry", HUBSPOT_STANDARD_FIELD_LIMIT),
+        ("City", "city", HUBSPOT_STANDARD_FIELD_LIMIT),
+        ("State/Region", "state_region", HUBSPOT_STANDARD_FIELD_LIMIT),
+        ("Postal Code", "postal_code", HUBSPOT_POSTAL_CODE_LIMIT),
+        ("Country", "country", HUBSPOT_STANDARD_FIELD_LIMIT),
+        ("Timezone", "timezone", HUBSPOT_STANDARD_FIELD_LIMIT),
+        ("Number of Employees", "number_of_employees", HUBSPOT_STANDARD_FIELD_LIMIT),
+        ("Annual Revenue", "annual_revenue", HUBSPOT_STANDARD_FIELD_LIMIT),
+        
+        # Custom fields
+        ("Business Type Description", "business_type_description", HUBSPOT_DESCRIPTION_LIMIT),
+        ("NAICS Code", "naics_code", HUBSPOT_NAICS_CODE_LIMIT),
+        ("Target Market", "target_market", HUBSPOT_DESCRIPTION_LIMIT),
+        ("Primary Products Services", "primary_products_services", HUBSPOT_DESCRIPTION_LIMIT),
+        ("Value Propositions", "value_propositions", HUBSPOT_DESCRIPTION_LIMIT),
+        ("Competitive Advantages", "competitive_advantages", HUBSPOT_DESCRIPTION_LIMIT),
+        ("Technologies Used", "technologies_used", HUBSPOT_DESCRIPTION_LIMIT),
+        ("Certifications Awards", "certifications_awards", HUBSPOT_DESCRIPTION_LIMIT),
+        ("Pain Points Addressed", "pain_points_addressed", HUBSPOT_DESCRIPTION_LIMIT),
+        
+        # Metadata
+        ("Site Content", "site_content", HUBSPOT_DESCRIPTION_LIMIT),
+    )
+    
     def __init__(self, filename: str) -> None:
         """Initialize CSV exporter with output filename."""
         self.filename = filename
+        # Rows added for write(), or staged for the next incremental batch
         self.rows: List[Dict[str, str]] = []
+        # Columns filled by rows added for write()
+        self._seen_fields: Set[str] = set()
         self._file_handle = None
         self._csv_writer = None
+        self._fieldnames: List[str] = []
         self._headers_written = False
+        self._last_flush = time.monotonic()
         self._processed_domains: set = set()
+        # Domains of staged incremental rows; processed once their rows are flushed
+        self._staged_domains: List[str] = []
+        # Guards the file handle and CSV writer
         self._write_lock = threading.Lock()
     
     def add_company(self, domain: str, company_data: Dict[str, Any]) -> None:
         """Add enriched company data to export."""
         domain = self._normalize_domain(domain)
         row = self._build_csv_row(domain, company_data)
-        self.rows.append(row)
+        with self._write_lock:
+            self.rows.append(row)
+            self._seen_fields.update(row)
         logger.debug(f"Added company {domain} to export queue")
     
     def write(self) -> None:
         """Write all collected data to CSV file."""
-        if not self.rows:
-            logger.warning("No data to export")
-            return
+        with self._write_lock:
+            if not self.rows:
+                logger.warning("No data to export")
+                return
+            
+            fieldnames = self._get_ordered_fieldnames()
+            
+            try:
+                self._write_csv_file(fieldnames)
+                logger.info(f"Exported {len(self.rows)} companies to {self.filename}")
+            except Exception as e:
+                logger.error(f"Failed to write CSV file: {e}")
+                raise
+    
+    def _get_ordered_fieldnames(self) -> List[str]:
+        """Get ordered list of fieldnames for CSV.
         
-        fieldnames = self._get_ordered_fieldnames()
+        Only columns some row fills are written, since an empty cell can
+        clear the property on HubSpot import.
+        """
+        # Required fields first, then the rest sorted
+        priority = [field for field in self._PRIORITY_FIELDS if field in self._seen_fields]
+        return priority + sorted(self._seen_fields - set(self._PRIORITY_FIELDS))
+    
+    def _write_csv_file(self, fieldnames: List[str]) -> None:
+        """Write CSV file with given fieldnames."""
+        with open(self.filename, 'w', newline='', encoding='utf-8',
+                  buffering=ExportConfig.WRITE_BUFFER_BYTES) as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(fieldnames)
+            writer.writerows([row.get(field, '') for field in fieldnames] for row in self.rows)
+    
+    def _drain_rows(self) -> None:
+        """Write staged incremental rows in one call.
         
-        try:
-            self._write_csv_file(fieldnames)
-            logger.info(f"Exported {len(self.rows)} companies to {self.filename}")
-        except Exception as e:
-            logger.error(f"Failed to write CSV file: {e}")
-            raise
+        The caller must hold the write lock.
+        """
+        if not self.rows:
+            return
+        writer = self._writer_for(self.rows[0])
+        fieldnames = self._fieldnames
+        writer.writerows([row.get(field, '') for field in fieldnames] for row in self.rows)
+        self.rows.clear()
     
     def _normalize_domain(self, domain: str) -> str:
         """Normalize domain for consistency."""
-        return domain.strip().lower()
+        return sys.intern(domain.strip().lower())
     
     def _build_csv_row(self, domain: str, company_data: Dict[str, Any]) -> Dict[str, str]:
-        """Build a CSV row from company data."""
-        row = {
-            # Required field
-            "Company Domain Name": domain,
-            
-            # Standard HubSpot fields
-            **self._build_standard_fields(domain, company_data),
-            
-            # Custom fields
-            **self._build_custom_fields(company_data),
-            
-            # Metadata
-            **self._build_metadata_fields(company_data)
-        }
+        """Build a CSV row from company data, leaving out empty fields."""
+        get = company_data.get
+        truncate = self._truncate_field
+        # Enrichment status is kept even when empty
+        row = {"Enrichment Status": get("enrichment_status", ENRICHMENT_STATUS_COMPLETED)}
+        
+        # Required field
+        if domain:
+            row["Company Domain Name"] = domain
+        
+        name = truncate(get("name", domain), HUBSPOT_NAME_LIMIT)
+        if name:
+            row["Name"] = name
+        
+        for column, key, limit in self._FIELD_SPEC:
+            value = get(key)
+            if value:
+                row[column] = truncate(value, limit)
+        
+        confidence_score = self._format_confidence_score(get("confidence_score"))
+        if confidence_score:
+            row["Confidence Score"] = confidence_score
         
         # Add error field if present
-        if "enrichment_error" in company_data:
-            row["Enrichment Error"] = self._truncate_field(
-                company_data["enrichment_error"], 
-                HUBSPOT_STANDARD_FIELD_LIMIT
-            )
+        error = get("enrichment_error")
+        if error:
+            row["Enrichment Error"] = truncate(error, HUBSPOT_STANDARD_FIELD_LIMIT)
         
-        # Remove empty values but keep enrichment status
-        return {k: v for k, v in row.items() if v or k == "Enrichment Status"}
-    
-    def _build_standard_fields(
-        self, 
-        domain: str, 
-        company_data: Dict[str, Any]
-    ) -> Dict[str, str]:
-        """Build standard HubSpot fields."""
-        return {
-            "Name": self._truncate_field(
-                company_data.get("name", domain), 
-                HUBSPOT_NAME_LIMIT
-            ),
-            "Company Description": self._truncate_field(
-                company_data.get("company_summary", ""), 
-                HUBSPOT_DESCRIPTION_LIMIT
-            ),
-            "Industry": self._truncate_field(
-                company_data.get("industry", ""), 
-                HUBSPOT_STANDARD_FIELD_LIMIT
-            ),
-            "City": self._truncate_field(
-                company_data.get("city", ""), 
-                HUBSPOT_STANDARD_FIELD_LIMIT
-            ),
-            "State/Region": self._truncate_field(
-                company_data.get("state_region", ""), 
-                HUBSPOT_STANDARD_FIELD_LIMIT
-            ),
-            "Postal Code": self._truncate_field(
-                company_data.get("postal_code", ""), 
-                HUBSPOT_POSTAL_CODE_LIMIT
-            ),
-            "Country": self._truncate_field(
-                company_data.get("country", ""), 
-                HUBSPOT_STANDARD_FIELD_LIMIT
-            ),
-            "Timezone": self._truncate_field(
-                company_data.get("timezone", ""), 
-                HUBSPOT_STANDARD_FIELD_LIMIT
-            ),
-            "Number of Employees": self._truncate_field(
-                company_data.get("number_of_employees", ""), 
-                HUBSPOT_STANDARD_FIELD_LIMIT
-            ),
-            "Annual Revenue": self._truncate_field(
-                company_data.get("annual_revenue", ""), 
-                HUBSPOT_STANDARD_FIELD_LIMIT
-            ),
-        }
-    
-    def _build_custom_fields(self, company_data: Dict[str, Any]) -> Dict[str, str]:
-        """Build custom HubSpot fields."""
-        return {
-            "Business Type Description": self._truncate_field(
-                company_data.get("business_type_description", ""), 
-                HUBSPOT_DESCRIPTION_LIMIT
-            ),
-            "NAICS Code": self._truncate_field(
-                company_data.get("naics_code", ""), 
-                HUBSPOT_NAICS_CODE_LIMIT
-            ),
-            "Target Market": self._truncate_field(
-                company_data.get("target_market", ""), 
-                HUBSPOT_DESCRIPTION_LIMIT
-            ),
-            "Primary Products Services": self._truncate_field(
-                company_data.get("primary_products_services", ""), 
-                HUBSPOT_DESCRIPTION_LIMIT
-            ),
-            "Value Propositions": self._truncate_field(
-                company_data.get("value_propositions", ""), 
-                HUBSPOT_DESCRIPTION_LIMIT
-            ),
-            "Competitive Advantages": self._truncate_field(
-                company_data.get("competitive_advantages", ""), 
-                HUBSPOT_DESCRIPTION_LIMIT
-            ),
-            "Technologies Used": self._truncate_field(
-                company_data.get("technologies_used", ""), 
-                HUBSPOT_DESCRIPTION_LIMIT
-            ),
-            "Certifications Awards": self._truncate_field(
-                company_data.get("certifications_awards", ""), 
-                HUBSPOT_DESCRIPTION_LIMIT
-            ),
-            "Pain Points Addressed": self._truncate_field(
-                company_data.get("pain_points_addressed", ""), 
-                HUBSPOT_DESCRIPTION_LIMIT
-            ),
-            "Confidence Score": self._format_confidence_score(
-                company_data.get("confidence_score")
-            ),
-        }
-    
-    def _build_metadata_fields(self, company_data: Dict[str, Any]) -> Dict[str, str]:
-        """Build enrichment metadata fields."""
-        return {
-            "Enrichment Status": company_data.get(
-                "enrichment_status", 
-                ENRICHMENT_STATUS_COMPLETED
-            ),
-            "Site Content": self._truncate_field(
-                company_data.get("site_content", ""), 
-                HUBSPOT_DESCRIPTION_LIMIT
-            )
-        }
+        return row
     
     def _truncate_field(self, value: Any, limit: int) -> str:
         """Truncate field value to specified limit and strip newlines."""
         if not value:
             return ""
-        # Convert to string, strip newlines, and truncate
-        cleaned = str(value).replace('\n', ' ').replace('\r', ' ')
-        return cleaned[:limit]
+        # Truncate first so only the kept part is scanned for newlines
+        text = value if type(value) is str else str(value)
+        return text[:limit].replace('\n', ' ').replace('\r', ' ')
     
     def _format_confidence_score(self, score: Any) -> str:
         """Format confidence score value."""
@@ -206,36 +215,13 @@ class CSVExporter:
         except (ValueError, TypeError):
             return ""
     
-    def _get_ordered_fieldnames(self) -> List[str]:
-        """Get ordered list of fieldnames for CSV."""
-        # Get all unique fieldnames
-        fieldnames = set()
-        for row in self.rows:
-            fieldnames.update(row.keys())
-        
-        # Sort with required fields first
-        ordered = sorted(list(fieldnames))
-        
-        # Move required fields to front
-        priority_fields = ["Company Domain Name", "Name"]
-        for field in reversed(priority_fields):
-            if field in ordered:
-                ordered.remove(field)
-                ordered.insert(0, field)
-        
-        return ordered
-    
-    def _write_csv_file(self, fieldnames: List[str]) -> None:
-        """Write CSV file with given fieldnames."""
-        with open(self.filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames, restval='')
-            writer.writeheader()
-            writer.writerows(self.rows)
-    
     def open_for_writing(self, append: bool = False) -> None:
         """Open file for incremental writing."""
         mode = 'a' if append and os.path.exists(self.filename) else 'w'
-        self._file_handle = open(self.filename, mode, newline='', encoding='utf-8')
+        self._file_handle = open(
+            self.filename, mode, newline='', encoding='utf-8',
+            buffering=ExportConfig.WRITE_BUFFER_BYTES
+        )
         self._headers_written = append and os.path.exists(self.filename) and os.path.getsize(self.filename) > 0
         
         if mode == 'a':
@@ -244,79 +230,71 @@ class CSVExporter:
             logger.info(f"Opened {self.filename} for writing (new file)")
     
     def write_company_incremental(self, domain: str, company_data: Dict[str, Any]) -> None:
-        """Write a single company to CSV immediately (thread-safe)."""
+        """Write a single company to CSV in the next batch (thread-safe)."""
+        # Build the row before taking the lock; only staging and IO are serialized
+        domain = self._normalize_domain(domain)
+        row = self._build_csv_row(domain, company_data)
+        
         with self._write_lock:
-            domain = self._normalize_domain(domain)
-            row = self._build_csv_row(domain, company_data)
-            
-            if not self._csv_writer:
-                # Initialize writer (for both new files and append mode)
-                fieldnames = self._get_fieldnames_from_row(row)
-                self._csv_writer = csv.DictWriter(
-                    self._file_handle, 
-                    fieldnames=fieldnames, 
-                    restval=''
-                )
-                
-                if not self._headers_written:
-                    self._csv_writer.writeheader()
-                    self._headers_written = True
+            # Staged and written in batches; see _write_batch_if_due
+            self.rows.append(row)
+            self._staged_domains.append(domain)
+            self._write_batch_if_due()
+            logger.debug(f"Staged company {domain} for CSV")
+    
+    def _write_batch_if_due(self) -> None:
+        """Write and flush staged rows every few rows or after a short interval.
+        
+        Rows still staged at a crash are lost and re-processed on resume.
+        """
+        now = time.monotonic()
+        if (len(self.rows) >= ExportConfig.FLUSH_EVERY_ROWS
+                or now - self._last_flush >= ExportConfig.FLUSH_INTERVAL_SECONDS):
+            self._drain_rows()
+            self._file_handle.flush()
+            self._last_flush = now
+            self._mark_staged_processed()
+    
+    def _mark_staged_processed(self) -> None:
+        """Mark the domains of flushed rows as processed.
+        
+        The caller must hold the write lock.
+        """
+        self._processed_domains.update(self._staged_domains)
+        self._staged_domains.clear()
+    
+    def _writer_for(self, row: Dict[str, str]) -> Any:
+        """Get the CSV writer, creating it and the header on first use.
+        
+        Rows are written as lists in self._fieldnames order, which avoids
+        DictWriter's per-row key checks.
+        """
+        if not self._csv_writer:
+            # Initialize writer (for both new files and append mode)
+            self._fieldnames = self._get_fieldnames_from_row(row)
+            self._csv_writer = csv.writer(self._file_handle)
             
-            self._csv_writer.writerow(row)
-            self._file_handle.flush()  # Ensure data is written to disk
-            self.mark_domain_processed(domain)
-            logger.debug(f"Wrote company {domain} to CSV")
+            if not self._headers_written:
+                self._csv_writer.writerow(self._fieldnames)
+                self._headers_written = True
+        
+        return self._csv_writer
     
     def close(self) -> None:
-        """Close the file handle."""
-        if self._file_handle:
-            self._file_handle.close()
-            self._file_handle = None
-            logger.info(f"Closed {self.filename}")
+        """Write staged rows and close the file handle."""
+        with self._write_lock:
+            if self._file_handle:
+                self._drain_rows()
+                self._file_handle.close()
+                self._file_handle = None
+                self._mark_staged_processed()
+                logger.info(f"Closed {self.filename}")
     
     def _get_fieldnames_from_row(self, row: Dict[str, str]) -> List[str]:
-        """Get ordered fieldnames from a single row."""
-        # Start with all possible fields that could be in any row
-        all_possible_fields = [
-            # Required fields
-            "Company Domain Name",
-            "Name",
-            
-            # Standard HubSpot fields
-            "Company Description",
-            "Industry",
-            "City",
-            "State/Region",
-            "Postal Code",
-            "Country",
-            "Timezone",
-            "Number of Employees",
-            "Annual Revenue",
-            
-            # Custom fields
-            "Business Type Description",
-            "NAICS Code",
-            "Target Market",
-            "Primary Products Services",
-            "Value Propositions",
-            "Competitive Advantages",
-            "Technologies Used",
-            "Certifications Awards",
-            "Pain Points Addressed",
-            "Confidence Score",
-            
-            # Metadata fields
-            "Enrichment Status",
-            "Site Content",
-            "Enrichment Error"
+        """Get ordered fieldnames: every known column, then any extras in the row."""
+        return list(self._BASE_FIELDNAMES) + [
+            field for field in row if field not in self._BASE_FIELDNAMES
         ]
-        
-        # Add any additional fields from the row that aren't in our list
-        for field in row.keys():
-            if field not in all_possible_fields:
-                all_possible_fields.append(field)
-        
-        return all_possible_fields
     
     def load_existing_domains(self) -> Set[str]:
         """Load domains from existing CSV file if it exists."""
@@ -326,13 +304,16 @@ class CSVExporter:
         
         domains = set()
         try:
-            with open(self.filename, 'r', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    if 'Company Domain Name' in row and row['Company Domain Name']:
-                        domain = self._normalize_domain(row['Company Domain Name'])
-                        domains.add(domain)
-                        self._processed_domains.add(domain)
+            with open(self.filename, 'r', newline='', encoding='utf-8') as csvfile:
+                # Positional rows; only the domain column is needed
+                reader = csv.reader(csvfile)
+                header = next(reader, [])
+                if 'Company Domain Name' in header:
+                    index = header.index('Company Domain Name')
+                    for row in reader:
+                        if index < len(row) and row[index]:
+                            domains.add(self._normalize_domain(row[index]))
+                self._processed_domains.update(domains)
             
             logger.info(f"Loaded {len(domains)} existing domains from {self.filename}")
             return domains
@@ -341,13 +322,13 @@ class CSVExporter:
             return set()
     
     def is_domain_processed(self, domain: str) -> bool:
-        """Check if a domain has already been processed (thread-safe)."""
-        normalized = self._normalize_domain(domain)
-        with self._write_lock:
-            return normalized in self._processed_domains
+        """Check if a domain has already been processed (thread-safe).
+        
+        Single set operations are atomic under the GIL, so this and
+        mark_domain_processed do not wait on the write lock.
+        """
+        return self._normalize_domain(domain) in self._processed_domains
     
     def mark_domain_processed(self, domain: str) -> None:
         """Mark a domain as processed (thread-safe)."""
-        normalized = self._normalize_domain(domain)
-        with self._write_lock:
-            self._processed_domains.add(normalized)
\ No newline at end of file
+        self._processed_domains.add(self._normalize_domain(domain))
\ No newline at end of file
@@ -6,25 +6,38 @@ from urllib.parse import urlparse
 
 from src.constants import MIN_DOMAIN_LENGTH
 
+# URL schemes extract_domain and normalize_url recognize
+_URL_SCHEMES = ("http://", "https://", "ftp://", "ftps://")
+_HTTP_SCHEMES = ("http://", "https://")
+
+# Hostname with an alphabetic or punycode TLD, e.g. "sub.example.co.uk"
+_DOMAIN_RE = re.compile(r'^[a-zA-Z0-9][a-zA-Z0-9-]*[a-zA-Z0-9]*\.([a-zA-Z]{2,}|xn--[a-zA-Z0-9]+)([\.][a-zA-Z]{2,}|[\.](xn--[a-zA-Z0-9]+))*$')
+
 
 def extract_domain(text: str) -> Optional[str]:
     """Extract domain from email or URL."""
     if not text:
         return None
     
-    text = text.strip().lower()
+    text = text.strip()
     
-    # Handle email addresses
+    # Handle email addresses; only the domain part needs lowercasing
     if "@" in text:
-        parts = text.split("@")
-        if len(parts) == 2:
-            domain = parts[1].strip()
+        _, _, domain = text.partition("@")
+        if "@" not in domain:
+            domain = domain.strip().lower()
             # Validate the email domain
             if domain and "." in domain:
                 return domain
     
+    text = text.lower()
+    
+    # Bare domains, the common case in domain lists, need no URL parsing
+    if not text.startswith("www.") and _DOMAIN_RE.match(text):
+        return text
+    
     # Handle URLs
-    if not text.startswith(("http://", "https://", "ftp://", "ftps://")):
+    if not text.startswith(_URL_SCHEMES):
         # Assume https if no protocol
         text = f"https://{text}"
     
@@ -45,8 +58,7 @@ def extract_domain(text: str) -> Optional[str]:
             domain = domain.split("/")[0]
         
         # Validate domain format
-        domain_pattern = re.compile(r'^[a-zA-Z0-9][a-zA-Z0-9-]*[a-zA-Z0-9]*\.([a-zA-Z]{2,}|xn--[a-zA-Z0-9]+)([\.][a-zA-Z]{2,}|[\.](xn--[a-zA-Z0-9]+))*$')
-        if domain and domain_pattern.match(domain):
+        if domain and _DOMAIN_RE.match(domain):
             return domain
         
         # Try simpler validation for edge cases
@@ -66,7 +78,7 @@ def normalize_url(url: str) -> str:
     
     url = url.strip()
     
-    if not url.startswith(("http://", "https://")):
+    if not url.startswith(_HTTP_SCHEMES):
         url = f"https://{url}"
     
     return url
\ No newline at end of file
@@ -1,6 +1,7 @@
 """File processing utilities for domain lists."""
 
 import logging
+import sys
 from pathlib import Path
 from typing import List, Set, Tuple
 
@@ -28,29 +29,34 @@ class DomainFileProcessor:
         seen_domains: Set[str] = set()
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    
-                    if not line or line.startswith('#'):
-                        continue
-                    
-                    domain = extract_domain(line)
-                    if not domain:
-                        error_msg = f"Line {line_num}: Invalid domain/URL '{line}'"
-                        errors.append(error_msg)
-                        logger.warning(error_msg)
-                        continue
-                    
-                    if domain in seen_domains:
-                        error_msg = f"Line {line_num}: Duplicate domain '{domain}'"
-                        errors.append(error_msg)
-                        logger.warning(error_msg)
-                        continue
-                    
-                    domains.append(domain)
-                    seen_domains.add(domain)
-                    
+            # Domain lists are small enough to read in one call. Newlines are
+            # already normalized to "\n", and unlike splitlines() this keeps
+            # line numbers the same as iterating the file.
+            lines = Path(file_path).read_text(encoding='utf-8').split('\n')
+            for line_num, line in enumerate(lines, 1):
+                line = line.strip()
+                
+                if not line or line.startswith('#'):
+                    continue
+                
+                domain = extract_domain(line)
+                if not domain:
+                    error_msg = f"Line {line_num}: Invalid domain/URL '{line}'"
+                    errors.append(error_msg)
+                    logger.warning(error_msg)
+                    continue
+                
+                # Interned: domains are reused as set and dict keys downstream
+                domain = sys.intern(domain)
+                if domain in seen_domains:
+                    error_msg = f"Line {line_num}: Duplicate domain '{domain}'"
+                    errors.append(error_msg)
+                    logger.warning(error_msg)
+                    continue
+                
+                domains.append(domain)
+                seen_domains.add(domain)
+                
         except Exception as e:
             error_msg = f"Error reading file: {e}"
             errors.append(error_msg)
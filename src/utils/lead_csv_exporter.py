@@ -4,14 +4,16 @@ import csv
 import logging
 import os
 import threading
-from typing import Dict, List, Any, Optional
+import time
+from typing import Dict, List, Any, Optional, Set, Tuple
 from datetime import datetime
 
 from src.constants import (
     HUBSPOT_NAME_LIMIT,
     HUBSPOT_DESCRIPTION_LIMIT,
     HUBSPOT_STANDARD_FIELD_LIMIT,
-    ENRICHMENT_STATUS_COMPLETED
+    ENRICHMENT_STATUS_COMPLETED,
+    ExportConfig
 )
 
 logger = logging.getLogger(__name__)
@@ -20,57 +22,150 @@ logger = logging.getLogger(__name__)
 class LeadCSVExporter:
     """Export lead data to CSV format for HubSpot import."""
     
+    # Every column _build_csv_row can produce, plus HubSpot contact
+    # columns left blank, in output order
+    _BASE_FIELDNAMES: Tuple[str, ...] = (
+        # Required fields
+        "Email",
+        "First Name",
+        "Last Name",
+        "Company Name",
+        
+        # Other standard fields
+        "Company Domain Name",
+        "Job Title",
+        "Phone Number",
+        "Lead Source",
+        
+        # Company info fields
+        "Company Industry",
+        "Company City",
+        "Company State/Region",
+        "Company Country",
+        "Company Employee Count",
+        "Company Annual Revenue",
+        
+        # Metadata fields
+        "Enrichment Status",
+        "Enrichment Date",
+        
+        # Lead fields
+        "Website URL",
+        "Lead Status",
+        "Lifecycle Stage",
+        "Buyer Persona",
+        "Lead Score Adjustment",
+        "Company Domain"
+    )
+    
+    # Columns the batch export puts first, when filled
+    _PRIORITY_FIELDS: Tuple[str, ...] = ("Email", "First Name", "Last Name", "Company Name")
+    
+    # (CSV column, lead data key, length limit) for plain text fields
+    _FIELD_SPEC: Tuple[Tuple[str, str, int], ...] = (
+        ("Buyer Persona", "buyer_persona", HUBSPOT_STANDARD_FIELD_LIMIT),
+        
+        # Company information
+        ("Company Industry", "company_industry", HUBSPOT_STANDARD_FIELD_LIMIT),
+        ("Company City", "company_city", HUBSPOT_STANDARD_FIELD_LIMIT),
+        ("Company State/Region", "company_state", HUBSPOT_STANDARD_FIELD_LIMIT),
+        ("Company Country", "company_country", HUBSPOT_STANDARD_FIELD_LIMIT),
+        ("Company Employee Count", "company_employees", HUBSPOT_STANDARD_FIELD_LIMIT),
+        ("Company Annual Revenue", "company_revenue", HUBSPOT_STANDARD_FIELD_LIMIT),
+    )
+    
     def __init__(self, filename: str) -> None:
         """Initialize CSV exporter with output filename."""
         self.filename = filename
+        # Rows added for write(), or staged for the next incremental batch
         self.rows: List[Dict[str, str]] = []
+        # Columns filled by rows added for write()
+        self._seen_fields: Set[str] = set()
         self._file_handle = None
         self._csv_writer = None
+        self._fieldnames: List[str] = []
         self._headers_written = False
+        self._last_flush = time.monotonic()
         self._write_lock = threading.Lock()
     
     def add_lead(self, email: str, domain: str, lead_data: Optional[Dict[str, Any]] = None) -> None:
         """Add lead data to export."""
         email = email.strip().lower()
         row = self._build_csv_row(email, domain, lead_data or {})
-        self.rows.append(row)
+        with self._write_lock:
+            self.rows.append(row)
+            self._seen_fields.update(row)
         logger.debug(f"Added lead {email} to export queue")
     
     def add_leads_from_scraped_emails(self, domain: str, emails: List[str], company_data: Optional[Dict[str, Any]] = None) -> None:
         """Add multiple leads from scraped emails."""
+        # Lead data depends only on the company, so it is built once and
+        # shared by every email
+        lead_data = {
+            "company": company_data.get("name", domain) if company_data else domain,
+            "company_domain": domain,
+            "lead_source": "Website Scraping",
+            "enrichment_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        if company_data:
+            # Add relevant company info to lead
+            lead_data.update({
+                "company_industry": company_data.get("industry", ""),
+                "company_city": company_data.get("city", ""),
+                "company_state": company_data.get("state_region", ""),
+                "company_country": company_data.get("country", ""),
+                "company_employees": company_data.get("number_of_employees", ""),
+                "company_revenue": company_data.get("annual_revenue", "")
+            })
+        
         for email in emails:
-            lead_data = {
-                "company": company_data.get("name", domain) if company_data else domain,
-                "company_domain": domain,
-                "lead_source": "Website Scraping",
-                "enrichment_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            if company_data:
-                # Add relevant company info to lead
-                lead_data.update({
-                    "company_industry": company_data.get("industry", ""),
-                    "company_city": company_data.get("city", ""),
-                    "company_state": company_data.get("state_region", ""),
-                    "company_country": company_data.get("country", ""),
-                    "company_employees": company_data.get("number_of_employees", ""),
-                    "company_revenue": company_data.get("annual_revenue", "")
-                })
             self.add_lead(email, domain, lead_data)
     
     def write(self) -> None:
         """Write all collected data to CSV file."""
-        if not self.rows:
-            logger.warning("No lead data to export")
-            return
+        with self._write_lock:
+            if not self.rows:
+                logger.warning("No lead data to export")
+                return
+            
+            fieldnames = self._get_ordered_fieldnames()
+            
+            try:
+                self._write_csv_file(fieldnames)
+                logger.info(f"Exported {len(self.rows)} leads to {self.filename}")
+            except Exception as e:
+                logger.error(f"Failed to write lead CSV file: {e}")
+                raise
+    
+    def _get_ordered_fieldnames(self) -> List[str]:
+        """Get ordered list of fieldnames for CSV.
         
-        fieldnames = self._get_ordered_fieldnames()
+        Only columns some row fills are written, since an empty cell can
+        clear the property on HubSpot import.
+        """
+        # Required fields first, then the rest sorted
+        priority = [field for field in self._PRIORITY_FIELDS if field in self._seen_fields]
+        return priority + sorted(self._seen_fields - set(self._PRIORITY_FIELDS))
+    
+    def _write_csv_file(self, fieldnames: List[str]) -> None:
+        """Write CSV file with given fieldnames."""
+        with open(self.filename, 'w', newline='', encoding='utf-8',
+                  buffering=ExportConfig.WRITE_BUFFER_BYTES) as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(fieldnames)
+            writer.writerows([row.get(field, '') for field in fieldnames] for row in self.rows)
+    
+    def _drain_rows(self) -> None:
+        """Write staged incremental rows in one call.
         
-        try:
-            self._write_csv_file(fieldnames)
-            logger.info(f"Exported {len(self.rows)} leads to {self.filename}")
-        except Exception as e:
-            logger.error(f"Failed to write lead CSV file: {e}")
-            raise
+        The caller must hold the write lock.
+        """
+        if not self.rows:
+            return
+        writer = self._writer_for(self.rows[0])
+        fieldnames = self._fieldnames
+        writer.writerows([row.get(field, '') for field in fieldnames] for row in self.rows)
+        self.rows.clear()
     
     def _build_csv_row(self, email: str, domain: str, lead_data: Dict[str, Any]) -> Dict[str, str]:
         """Build a CSV row from lead data."""
@@ -88,110 +183,60 @@ class LeadCSVExporter:
             elif len(name_parts) == 1:
                 firstname = name_parts[0].title()
         
+        get = lead_data.get
+        truncate = self._truncate_field
         row = {
             # Required fields for HubSpot contact import
             "Email": email,
             
-            # Standard contact fields
-            "First Name": self._truncate_field(firstname, HUBSPOT_NAME_LIMIT),
-            "Last Name": self._truncate_field(lastname, HUBSPOT_NAME_LIMIT),
-            "Company Name": self._truncate_field(
-                lead_data.get("company", domain), 
-                HUBSPOT_STANDARD_FIELD_LIMIT
-            ),
-            
             # Additional fields
             "Website URL": f"https://{domain}",
             "Lead Status": "New",
             "Lifecycle Stage": "Lead",
             
-            # Custom fields from enrichment
-            "Lead Source": self._truncate_field(
-                lead_data.get("lead_source", "Website Scraping"), 
-                HUBSPOT_STANDARD_FIELD_LIMIT
-            ),
-            "Buyer Persona": self._truncate_field(
-                lead_data.get("buyer_persona", ""), 
-                HUBSPOT_STANDARD_FIELD_LIMIT
-            ),
-            "Lead Score Adjustment": str(lead_data.get("lead_score_adjustment", "0")),
-            
-            # Company information
-            "Company Domain": domain,
-            "Company Industry": self._truncate_field(
-                lead_data.get("company_industry", ""), 
-                HUBSPOT_STANDARD_FIELD_LIMIT
-            ),
-            "Company City": self._truncate_field(
-                lead_data.get("company_city", ""), 
-                HUBSPOT_STANDARD_FIELD_LIMIT
-            ),
-            "Company State/Region": self._truncate_field(
-                lead_data.get("company_state", ""), 
-                HUBSPOT_STANDARD_FIELD_LIMIT
-            ),
-            "Company Country": self._truncate_field(
-                lead_data.get("company_country", ""), 
-                HUBSPOT_STANDARD_FIELD_LIMIT
-            ),
-            "Company Employee Count": self._truncate_field(
-                lead_data.get("company_employees", ""), 
-                HUBSPOT_STANDARD_FIELD_LIMIT
-            ),
-            "Company Annual Revenue": self._truncate_field(
-                lead_data.get("company_revenue", ""), 
-                HUBSPOT_STANDARD_FIELD_LIMIT
-            ),
-            
-            # Metadata
-            "Enrichment Status": lead_data.get(
-                "enrichment_status", 
-                ENRICHMENT_STATUS_COMPLETED
-            ),
-            "Enrichment Date": lead_data.get("enrichment_date", ""),
+            # Metadata, kept even when empty
+            "Enrichment Status": get("enrichment_status", ENRICHMENT_STATUS_COMPLETED)
         }
         
-        # Remove empty values but keep required fields
-        return {k: v for k, v in row.items() if v or k in ["Email", "Enrichment Status"]}
+        # Contact and lead fields, left out when empty
+        optional = (
+            ("First Name", truncate(firstname, HUBSPOT_NAME_LIMIT)),
+            ("Last Name", truncate(lastname, HUBSPOT_NAME_LIMIT)),
+            ("Company Name", truncate(get("company", domain), HUBSPOT_STANDARD_FIELD_LIMIT)),
+            ("Lead Source", truncate(
+                get("lead_source", "Website Scraping"), HUBSPOT_STANDARD_FIELD_LIMIT
+            )),
+            ("Lead Score Adjustment", str(get("lead_score_adjustment", "0"))),
+            ("Company Domain", domain),
+            ("Enrichment Date", get("enrichment_date", "")),
+        )
+        for column, value in optional:
+            if value:
+                row[column] = value
+        
+        # Custom and company fields from enrichment
+        for column, key, limit in self._FIELD_SPEC:
+            value = get(key)
+            if value:
+                row[column] = truncate(value, limit)
+        
+        return row
     
     def _truncate_field(self, value: Any, limit: int) -> str:
         """Truncate field value to specified limit and strip newlines."""
         if not value:
             return ""
-        # Convert to string, strip newlines, and truncate
-        cleaned = str(value).replace('\n', ' ').replace('\r', ' ')
-        return cleaned[:limit]
-    
-    def _get_ordered_fieldnames(self) -> List[str]:
-        """Get ordered list of fieldnames for CSV."""
-        # Get all unique fieldnames
-        fieldnames = set()
-        for row in self.rows:
-            fieldnames.update(row.keys())
-        
-        # Sort with required fields first
-        ordered = sorted(list(fieldnames))
-        
-        # Move required fields to front
-        priority_fields = ["Email", "First Name", "Last Name", "Company Name"]
-        for field in reversed(priority_fields):
-            if field in ordered:
-                ordered.remove(field)
-                ordered.insert(0, field)
-        
-        return ordered
-    
-    def _write_csv_file(self, fieldnames: List[str]) -> None:
-        """Write CSV file with given fieldnames."""
-        with open(self.filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames, restval='')
-            writer.writeheader()
-            writer.writerows(self.rows)
+        # Truncate first so only the kept part is scanned for newlines
+        text = value if type(value) is str else str(value)
+        return text[:limit].replace('\n', ' ').replace('\r', ' ')
     
     def open_for_writing(self, append: bool = False) -> None:
         """Open file for incremental writing."""
         mode = 'a' if append and os.path.exists(self.filename) else 'w'
-        self._file_handle = open(self.filename, mode, newline='', encoding='utf-8')
+        self._file_handle = open(
+            self.filename, mode, newline='', encoding='utf-8',
+            buffering=ExportConfig.WRITE_BUFFER_BYTES
+        )
         self._headers_written = append and os.path.exists(self.filename) and os.path.getsize(self.filename) > 0
         
         if mode == 'a':
@@ -200,67 +245,57 @@ class LeadCSVExporter:
             logger.info(f"Opened {self.filename} for writing (new file)")
     
     def write_lead_incremental(self, email: str, domain: str, lead_data: Dict[str, Any]) -> None:
-        """Write a single lead to CSV immediately (thread-safe)."""
+        """Write a single lead to CSV in the next batch (thread-safe)."""
+        # Build the row before taking the lock; only staging and IO are serialized
+        email = email.strip().lower()
+        row = self._build_csv_row(email, domain, lead_data)
+        
         with self._write_lock:
-            email = email.strip().lower()
-            row = self._build_csv_row(email, domain, lead_data)
-            
-            if not self._csv_writer:
-                # Initialize writer (for both new files and append mode)
-                fieldnames = self._get_fieldnames_from_row(row)
-                self._csv_writer = csv.DictWriter(
-                    self._file_handle, 
-                    fieldnames=fieldnames, 
-                    restval=''
-                )
-                
-                if not self._headers_written:
-                    self._csv_writer.writeheader()
-                    self._headers_written = True
+            # Staged and written in batches; see _write_batch_if_due
+            self.rows.append(row)
+            self._write_batch_if_due()
+            logger.debug(f"Staged lead {email} for CSV")
+    
+    def _write_batch_if_due(self) -> None:
+        """Write and flush staged rows every few rows or after a short interval.
+        
+        Rows still staged at a crash are lost and re-processed on resume.
+        """
+        now = time.monotonic()
+        if (len(self.rows) >= ExportConfig.FLUSH_EVERY_ROWS
+                or now - self._last_flush >= ExportConfig.FLUSH_INTERVAL_SECONDS):
+            self._drain_rows()
+            self._file_handle.flush()
+            self._last_flush = now
+    
+    def _writer_for(self, row: Dict[str, str]) -> Any:
+        """Get the CSV writer, creating it and the header on first use.
+        
+        Rows are written as lists in self._fieldnames order, which avoids
+        DictWriter's per-row key checks.
+        """
+        if not self._csv_writer:
+            # Initialize writer (for both new files and append mode)
+            self._fieldnames = self._get_fieldnames_from_row(row)
+            self._csv_writer = csv.writer(self._file_handle)
             
-            self._csv_writer.writerow(row)
-            self._file_handle.flush()  # Ensure data is written to disk
-            logger.debug(f"Wrote lead {email} to CSV")
+            if not self._headers_written:
+                self._csv_writer.writerow(self._fieldnames)
+                self._headers_written = True
+        
+        return self._csv_writer
     
     def close(self) -> None:
-        """Close the file handle."""
-        if self._file_handle:
-            self._file_handle.close()
-            self._file_handle = None
-            logger.info(f"Closed {self.filename}")
+        """Write staged rows and close the file handle."""
+        with self._write_lock:
+            if self._file_handle:
+                self._drain_rows()
+                self._file_handle.close()
+                self._file_handle = None
+                logger.info(f"Closed {self.filename}")
     
     def _get_fieldnames_from_row(self, row: Dict[str, str]) -> List[str]:
-        """Get ordered fieldnames from a single row."""
-        # Start with all possible fields that could be in any row
-        all_possible_fields = [
-            # Required fields
-            "Email",
-            "First Name", 
-            "Last Name",
-            "Company Name",
-            
-            # Other standard fields
-            "Company Domain Name",
-            "Job Title",
-            "Phone Number",
-            "Lead Source",
-            
-            # Company info fields
-            "Company Industry",
-            "Company City",
-            "Company State/Region",
-            "Company Country",
-            "Company Employee Count",
-            "Company Annual Revenue",
-            
-            # Metadata fields
-            "Enrichment Status",
-            "Enrichment Date"
+        """Get ordered fieldnames: every known column, then any extras in the row."""
+        return list(self._BASE_FIELDNAMES) + [
+            field for field in row if field not in self._BASE_FIELDNAMES
         ]
-        
-        # Add any additional fields from the row that aren't in our list
-        for field in row.keys():
-            if field not in all_possible_fields:
-                all_possible_fields.append(field)
-        
-        return all_possible_fields
\ No newline at end of file
@@ -1,14 +1,22 @@
 """Logging configuration utilities."""
 
+import atexit
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 
-# Add common library to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "common"))
+# Add common library to path, once per process
+_COMMON_PATH = str(Path(__file__).parent.parent.parent.parent / "common")
+if _COMMON_PATH not in sys.path:
+    sys.path.insert(0, _COMMON_PATH)
 
 from utils.logger import get_logger
 
+# Writes the queued log records to the real handlers on a background thread
+_queue_listener: Optional[QueueListener] = None
+
 
 def setup_logging(level: str = "INFO", log_file: Optional[str] = None) -> None:
     """Set up logging configuration using common logger."""
@@ -33,12 +41,31 @@ def setup_logging(level: str = "INFO", log_file: Optional[str] = None) -> None:
     # Get logger instance and configure root logger
     logger_instance = get_logger("dealdriver", logger_config)
     
-    # Set up root logger to use the same configuration
+    # Set up root logger to use the same configuration. Records are queued
+    # and written by a listener thread, so worker threads never block on
+    # console or file I/O and rotation
     import logging
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+    else:
+        atexit.register(_stop_queue_listener)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_listener = QueueListener(
+        log_queue, *logger_instance.logger.handlers, respect_handler_level=True
+    )
+    _queue_listener.start()
+    
     root_logger = logging.getLogger()
-    root_logger.handlers = logger_instance.logger.handlers
+    root_logger.handlers = [QueueHandler(log_queue)]
     root_logger.setLevel(getattr(logging, level.upper()))
     
     # Quiet down noisy libraries
     logging.getLogger("urllib3").setLevel(logging.WARNING)
-    logging.getLogger("selenium").setLevel(logging.WARNING)
\ No newline at end of file
+    logging.getLogger("selenium").setLevel(logging.WARNING)
+
+
+def _stop_queue_listener() -> None:
+    """Flush queued log records at interpreter exit."""
+    if _queue_listener is not None:
+        _queue_listener.stop()
@@ -1,10 +1,16 @@
+import itertools
 import logging
 import multiprocessing as mp
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    TimeoutError as FuturesTimeoutError,
+    wait,
+)
 from dataclasses import dataclass
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 import queue
-import threading
 import time
 from functools import partial
 
@@ -13,6 +19,11 @@ from src.utils.rate_limiter import rate_limit_manager
 
 logger = logging.getLogger(__name__)
 
+# Rough seconds one enrichment item spends in flight (scrape plus analysis),
+# used to size pools from API rate limits
+ITEM_LATENCY_SECONDS = 5.0
+MAX_RATE_LIMITED_WORKERS = 32
+
 
 @dataclass
 class WorkerConfig:
@@ -29,10 +40,8 @@ class EnrichmentWorkerPool:
     def __init__(self, config: WorkerConfig):
         self.config = config
         self.executor = None
-        self.futures = []
         self.results = []
         self.errors = []
-        self.progress_lock = threading.Lock()
         self.processed_count = 0
         self.total_count = 0
         
@@ -48,24 +57,12 @@ class EnrichmentWorkerPool:
             # Handle graceful shutdown
             if exc_type == KeyboardInterrupt:
                 logger.info("Received interrupt signal, shutting down gracefully...")
-                # Cancel pending futures
-                for future in self.futures:
-                    if not future.done():
-                        future.cancel()
-                
-                # Shutdown with shorter wait to exit faster
+                # Cancel everything still queued; tasks already running
+                # finish before the pool closes
                 self.executor.shutdown(wait=True, cancel_futures=True)
             else:
                 self.executor.shutdown(wait=True)
     
-    def submit_task(self, func: Callable, *args, **kwargs) -> None:
-        """Submit a task to the worker pool"""
-        if not self.executor:
-            raise RuntimeError("Worker pool not initialized. Use with statement.")
-        
-        future = self.executor.submit(func, *args, **kwargs)
-        self.futures.append(future)
-    
     def process_batch(self, items: List[Any], process_func: Callable, 
                      callback: Optional[Callable] = None) -> Tuple[List[Any], List[Dict]]:
         """
@@ -81,48 +78,80 @@ class EnrichmentWorkerPool:
         """
         self.total_count = len(items)
         self.processed_count = 0
+        counter = itertools.count(1)
         results = []
         errors = []
         
-        # Submit all tasks
-        for item in items:
-            self.submit_task(self._process_with_error_handling, item, process_func)
+        if not self.executor:
+            raise RuntimeError("Worker pool not initialized. Use with statement.")
         
-        # Collect results as they complete
+        # Items go out in chunks; process pools get larger chunks to cut the
+        # per-item pickling and IPC, threads keep one item per task so slow
+        # network-bound items don't hold up the rest of a chunk
+        chunksize = 1
+        if self.config.use_processes:
+            chunksize = max(1, len(items) // (4 * self.config.num_workers))
+        chunks = (items[start:start + chunksize] for start in range(0, len(items), chunksize))
+        
+        # Only a window of chunks is in flight at a time, so memory stays
+        # proportional to the worker count rather than the batch size
+        window = 2 * self.config.num_workers
+        inflight = set()
+        deadline = time.monotonic() + self.config.timeout
         try:
-            for future in as_completed(self.futures, timeout=self.config.timeout):
-                try:
-                    result, error = future.result()
-                    
-                    with self.progress_lock:
-                        self.processed_count += 1
-                        
-                        if error:
-                            errors.append(error)
-                            logger.error(f"Error processing item: {error}")
-                        else:
-                            results.append(result)
-                        
-                        if callback:
-                            callback(self.processed_count, self.total_count, result, error)
+            for chunk in itertools.islice(chunks, window):
+                inflight.add(self.executor.submit(self._process_chunk, chunk, process_func))
+            
+            # Collect results as they complete, topping up the window
+            while inflight:
+                done, inflight = wait(
+                    inflight, timeout=deadline - time.monotonic(), return_when=FIRST_COMPLETED
+                )
+                if not done:
+                    raise FuturesTimeoutError(f"{len(inflight)} tasks unfinished after {self.config.timeout}s")
+                
+                for chunk in itertools.islice(chunks, len(done)):
+                    inflight.add(self.executor.submit(self._process_chunk, chunk, process_func))
+                
+                for future in done:
+                    try:
+                        for result, error in future.result():
+                            # Completions are collected on this thread only, so the
+                            # counter and lists need no lock
+                            self.processed_count = next(counter)
                             
-                except Exception as e:
-                    logger.error(f"Future execution failed: {str(e)}")
-                    errors.append({
-                        'error': str(e),
-                        'type': 'future_execution_error'
-                    })
+                            if error:
+                                errors.append(error)
+                                logger.error("Error processing item: %s", error)
+                            else:
+                                results.append(result)
+                            
+                            if callback:
+                                callback(self.processed_count, self.total_count, result, error)
+                                
+                    except Exception as e:
+                        logger.error("Future execution failed: %s", e)
+                        errors.append({
+                            'error': str(e),
+                            'type': 'future_execution_error'
+                        })
         except KeyboardInterrupt:
             logger.info("Batch processing interrupted by user")
-            # Cancel remaining futures
-            for future in self.futures:
+            # Cancel remaining futures; unsubmitted chunks are simply dropped
+            for future in inflight:
                 if not future.done():
                     future.cancel()
             raise
         
         return results, errors
     
-    def _process_with_error_handling(self, item: Any, process_func: Callable) -> Tuple[Optional[Any], Optional[Dict]]:
+    @staticmethod
+    def _process_chunk(chunk: List[Any], process_func: Callable) -> List[Tuple[Optional[Any], Optional[Dict]]]:
+        """Process a chunk of items, returning a (result, error) pair per item"""
+        return [EnrichmentWorkerPool._process_with_error_handling(item, process_func) for item in chunk]
+    
+    @staticmethod
+    def _process_with_error_handling(item: Any, process_func: Callable) -> Tuple[Optional[Any], Optional[Dict]]:
         """Process an item with error handling"""
         try:
             result = process_func(item)
@@ -154,16 +183,23 @@ class RateLimitedWorker:
         for api in rate_limit_apis:
             wait_time = rate_limit_manager.acquire(api)
             if wait_time > 0:
-                logger.debug(f"Rate limit wait for {api}: {wait_time:.2f}s")
+                logger.debug("Rate limit wait for %s: %.2fs", api, wait_time)
         
         # Process the item
         return process_func(item)
 
 
 def create_enrichment_worker_pool(num_workers: Optional[int] = None, 
-                                 use_processes: bool = False) -> EnrichmentWorkerPool:
+                                 use_processes: bool = False,
+                                 rate_limit_apis: Optional[List[str]] = None) -> EnrichmentWorkerPool:
     """Create a configured worker pool for enrichment tasks"""
-    if num_workers is None:
+    if num_workers is None and rate_limit_apis:
+        # Enrichment is I/O-bound, so by Little's law the useful concurrency
+        # is the allowed rate of the strictest API times the item latency
+        calls_per_second = min(rate_limit_manager.get_limiter(api).refill_rate for api in rate_limit_apis)
+        num_workers = min(MAX_RATE_LIMITED_WORKERS, max(1, int(calls_per_second * ITEM_LATENCY_SECONDS)))
+        logger.info("Sized worker pool to %d workers for %g calls/s", num_workers, calls_per_second)
+    elif num_workers is None:
         # Default to CPU count but cap at 4 for API rate limiting
         num_workers = min(mp.cpu_count(), 4)
     
@@ -178,7 +214,7 @@ def create_enrichment_worker_pool(num_workers: Optional[int] = None,
 
 def batch_process_with_progress(items: List[Any], 
                                process_func: Callable,
-                               num_workers: int = 4,
+                               num_workers: Optional[int] = None,
                                progress_callback: Optional[Callable] = None,
                                rate_limit_apis: Optional[List[str]] = None) -> Tuple[List[Any], List[Dict]]:
     """
@@ -187,14 +223,15 @@ def batch_process_with_progress(items: List[Any],
     Args:
         items: Items to process
         process_func: Function to process each item
-        num_workers: Number of parallel workers
+        num_workers: Number of parallel workers, or None to size the pool
+            from the rate limits of rate_limit_apis
         progress_callback: Optional callback for progress updates
         rate_limit_apis: Optional list of APIs to rate limit
         
     Returns:
         Tuple of (results, errors)
     """
-    with create_enrichment_worker_pool(num_workers) as pool:
+    with create_enrichment_worker_pool(num_workers, rate_limit_apis=rate_limit_apis) as pool:
         if rate_limit_apis:
             # Wrap the process function with rate limiting
             wrapped_func = partial(
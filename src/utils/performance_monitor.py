@@ -1,17 +1,22 @@
 """Performance monitoring utilities for scraping operations."""
 
+import sys
 import time
 import logging
+from collections import Counter
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from datetime import datetime
-import statistics
 
 logger = logging.getLogger(__name__)
 
+# One ScrapingMetrics is kept per scraped domain, so it drops the per-instance
+# __dict__ where dataclass slots are available (Python 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class ScrapingMetrics:
     """Metrics for a scraping operation."""
     domain: str
@@ -25,7 +30,7 @@ class ScrapingMetrics:
     
     def complete(self, success: bool, content_size: int = 0, emails_found: int = 0, error: Optional[str] = None):
         """Mark the operation as complete."""
-        self.end_time = time.time()
+        self.end_time = time.monotonic()
         self.duration = self.end_time - self.start_time
         self.success = success
         self.content_size = content_size
@@ -39,6 +44,7 @@ class PerformanceReport:
     total_domains: int = 0
     successful_scrapes: int = 0
     failed_scrapes: int = 0
+    success_rate: float = 0  # Percent of domains scraped successfully
     total_duration: float = 0
     average_duration: float = 0
     min_duration: float = 0
@@ -46,7 +52,7 @@ class PerformanceReport:
     domains_per_minute: float = 0
     total_content_size: int = 0
     total_emails_found: int = 0
-    error_summary: Dict[str, int] = field(default_factory=dict)
+    error_summary: Dict[str, int] = field(default_factory=Counter)
     
     @classmethod
     def from_metrics(cls, metrics: List[ScrapingMetrics]) -> 'PerformanceReport':
@@ -57,11 +63,19 @@ class PerformanceReport:
         report = cls()
         report.total_domains = len(metrics)
         
-        durations = []
+        # Duration stats are folded into the single pass over the metrics
+        timed_count = 0
+        min_duration = float('inf')
+        max_duration = 0.0
         for metric in metrics:
-            if metric.duration:
-                durations.append(metric.duration)
-                report.total_duration += metric.duration
+            duration = metric.duration
+            if duration:
+                timed_count += 1
+                report.total_duration += duration
+                if duration < min_duration:
+                    min_duration = duration
+                if duration > max_duration:
+                    max_duration = duration
             
             if metric.success:
                 report.successful_scrapes += 1
@@ -69,17 +83,18 @@ class PerformanceReport:
                 report.total_emails_found += metric.emails_found
             else:
                 report.failed_scrapes += 1
-                error_type = metric.error or "Unknown"
-                report.error_summary[error_type] = report.error_summary.get(error_type, 0) + 1
+                report.error_summary[metric.error or "Unknown"] += 1
+        
+        report.success_rate = report.successful_scrapes * 100.0 / report.total_domains
         
-        if durations:
-            report.average_duration = statistics.mean(durations)
-            report.min_duration = min(durations)
-            report.max_duration = max(durations)
+        if timed_count:
+            report.average_duration = report.total_duration / timed_count
+            report.min_duration = min_duration
+            report.max_duration = max_duration
             
             # Calculate throughput
             if report.total_duration > 0:
-                report.domains_per_minute = (report.total_domains / report.total_duration) * 60
+                report.domains_per_minute = report.total_domains * 60.0 / report.total_duration
         
         return report
     
@@ -95,7 +110,7 @@ class PerformanceReport:
         print(self.REPORT_SEPARATOR)
         print(f"Total Domains: {self.total_domains}")
         if self.total_domains > 0:
-            print(f"Successful: {self.successful_scrapes} ({self.successful_scrapes/self.total_domains*100:.1f}%)")
+            print(f"Successful: {self.successful_scrapes} ({self.success_rate:.1f}%)")
             print(f"Failed: {self.failed_scrapes} ({self.failed_scrapes/self.total_domains*100:.1f}%)")
         else:
             print(f"Successful: {self.successful_scrapes} (0.0%)")
@@ -122,13 +137,13 @@ class PerformanceMonitor:
     
     def __init__(self):
         self.metrics: List[ScrapingMetrics] = []
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
     
     def start_scrape(self, domain: str) -> ScrapingMetrics:
         """Start tracking a scrape operation."""
         metric = ScrapingMetrics(
             domain=domain,
-            start_time=time.time()
+            start_time=time.monotonic()
         )
         self.metrics.append(metric)
         return metric
@@ -155,13 +170,12 @@ class PerformanceMonitor:
         
         logger.info(f"Scraping Performance Summary:")
         logger.info(f"  Total: {report.total_domains} domains in {report.total_duration:.2f}s")
-        success_rate = (report.successful_scrapes/report.total_domains*100) if report.total_domains > 0 else 0
-        logger.info(f"  Success Rate: {report.successful_scrapes}/{report.total_domains} ({success_rate:.1f}%)")
+        logger.info(f"  Success Rate: {report.successful_scrapes}/{report.total_domains} ({report.success_rate:.1f}%)")
         logger.info(f"  Throughput: {report.domains_per_minute:.1f} domains/minute")
         logger.info(f"  Avg Duration: {report.average_duration:.2f}s per domain")
         
         if report.error_summary:
-            logger.warning(f"  Errors: {report.error_summary}")
+            logger.warning(f"  Errors: {dict(report.error_summary)}")
 
 
 # Global performance monitor instance
@@ -12,51 +12,69 @@ class RateLimitConfig:
     min_interval: float = 0.1
 
 
+# Token counts are kept in integer micro-tokens and time in integer
+# nanoseconds so refills neither drift nor lose fractions of a token
+_MICRO_TOKENS = 1_000_000
+_NS_PER_SECOND = 1_000_000_000
+
+
 class ThreadSafeRateLimiter:
     """Thread-safe rate limiter using token bucket algorithm"""
     
     def __init__(self, config: RateLimitConfig):
         self.config = config
-        self.tokens = config.burst_size
         self.max_tokens = config.burst_size
         self.refill_rate = config.calls_per_second
-        self.last_refill = time.time()
-        self.lock = threading.Lock()
+        self._micro_tokens = config.burst_size * _MICRO_TOKENS
+        self._max_micro_tokens = self._micro_tokens
+        # Micro-tokens accrued per second
+        self._micro_rate = round(config.calls_per_second * _MICRO_TOKENS)
+        # Accrued token-nanoseconds not yet worth a whole micro-token
+        self._refill_carry = 0
+        self.last_refill = time.monotonic_ns()
+        # Waiters sleep on the condition until their tokens are due
+        self.condition = threading.Condition()
         self.min_interval = config.min_interval
+    
+    @property
+    def tokens(self) -> float:
+        """Tokens currently in the bucket"""
+        return self._micro_tokens / _MICRO_TOKENS
         
     def acquire(self, tokens: int = 1) -> float:
         """
         Acquire tokens from the bucket, blocking if necessary.
         Returns the time waited.
         """
-        start_time = time.time()
+        start_time = time.monotonic()
+        needed = tokens * _MICRO_TOKENS
         
-        with self.lock:
-            while True:
+        with self.condition:
+            self._refill()
+            while self._micro_tokens < needed:
+                # Sleep exactly until enough tokens will have accrued, with no
+                # min_interval floor; wait() releases the lock meanwhile and
+                # returns early if notified
+                deficit = needed - self._micro_tokens
+                self.condition.wait(timeout=deficit / self._micro_rate)
                 self._refill()
-                
-                if self.tokens >= tokens:
-                    self.tokens -= tokens
-                    wait_time = time.time() - start_time
-                    return wait_time
-                
-                # Calculate time to wait for enough tokens
-                tokens_needed = tokens - self.tokens
-                wait_time = max(tokens_needed / self.refill_rate, self.min_interval)
-                
-                # Release lock while waiting
-                self.lock.release()
-                time.sleep(wait_time)
-                self.lock.acquire()
+            
+            self._micro_tokens -= needed
+            # Let the next waiter re-check the bucket
+            self.condition.notify()
+            return time.monotonic() - start_time
     
     def _refill(self):
         """Refill tokens based on elapsed time"""
-        now = time.time()
-        elapsed = now - self.last_refill
+        now = time.monotonic_ns()
         
-        # Add tokens based on elapsed time
-        new_tokens = elapsed * self.refill_rate
-        self.tokens = min(self.tokens + new_tokens, self.max_tokens)
+        # Add tokens based on elapsed time, carrying the remainder over
+        accrued = (now - self.last_refill) * self._micro_rate + self._refill_carry
+        new_tokens, self._refill_carry = divmod(accrued, _NS_PER_SECOND)
+        self._micro_tokens += new_tokens
+        if self._micro_tokens >= self._max_micro_tokens:
+            self._micro_tokens = self._max_micro_tokens
+            self._refill_carry = 0
         self.last_refill = now
 
 
@@ -76,6 +94,12 @@ class APIRateLimitManager:
     
     def get_limiter(self, api_name: str, config: Optional[RateLimitConfig] = None) -> ThreadSafeRateLimiter:
         """Get or create a rate limiter for an API"""
+        # Limiters are never replaced once created, and dict reads are atomic
+        # under the GIL, so existing ones are looked up without the lock
+        limiter = self.limiters.get(api_name)
+        if limiter is not None:
+            return limiter
+        
         with self.lock:
             if api_name not in self.limiters:
                 if config is None:
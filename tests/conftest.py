@@ -8,14 +8,12 @@ from unittest.mock import Mock, MagicMock
 import tempfile
 import shutil
 
-# Add project to path
+# Add project and common library to path, skipping entries already present
 project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
-sys.path.insert(0, str(project_root / "src"))
-
-# Add common library to path
 common_path = project_root.parent / "common"
-sys.path.insert(0, str(common_path))
+for path in (project_root, project_root / "src", common_path):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
 
 
 @pytest.fixture
@@ -123,6 +121,16 @@ def sample_lead_analysis():
     }
 
 
+@pytest.fixture
+def analyze_leads_one_by_one():
+    """Give a mock analyzer an analyze_leads_batch that calls analyze_lead per lead."""
+    def bind(mock_analyzer):
+        mock_analyzer.analyze_leads_batch = lambda content, lead_infos: [
+            mock_analyzer.analyze_lead(content, lead_info) for lead_info in lead_infos
+        ]
+    return bind
+
+
 @pytest.fixture
 def test_domains():
     """List of test domains for e2e testing."""
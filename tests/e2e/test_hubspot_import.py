@@ -1,15 +1,13 @@
 """End-to-end tests for HubSpot import functionality."""
 
 import pytest
-import json
 import csv
-import os
+import io
 from pathlib import Path
-import tempfile
-import shutil
 from unittest.mock import patch, Mock, MagicMock
 import luigi
 import logging
+import orjson
 import sys
 
 # Disable Luigi logging during tests
@@ -23,21 +21,60 @@ sys.modules['common.clients.hubspot'] = MagicMock()
 from src.pipeline import DomainPipeline
 from src.tasks.hubspot_import import (
     HubSpotBulkImportTask,
-    ImportAllTask
+    ImportAllTask,
+    _FakeHubSpotClient
 )
 
+_COMPANY_FIELDS = (
+    'domain', 'business_type', 'naics_code', 'success',
+    'enriched_at', 'confidence_score'
+)
+_COMPANY_ROWS = (
+    ('techcorp.com', 'Software Development', '541511', 'true', '2024-01-01T00:00:00', '0.9'),
+    ('retailco.com', 'E-commerce Retail', '454110', 'true', '2024-01-01T00:00:00', '0.85'),
+)
+
+_LEAD_FIELDS = (
+    'email', 'first_name', 'last_name', 'company_domain',
+    'buyer_persona', 'lead_score_adjustment', 'enriched_at'
+)
+_LEAD_ROWS = (
+    ('john.doe@techcorp.com', 'John', 'Doe', 'techcorp.com',
+     'Technical Decision Maker', '50', '2024-01-01T00:00:00'),
+    ('jane.smith@retailco.com', 'Jane', 'Smith', 'retailco.com',
+     'Business Decision Maker', '40', '2024-01-01T00:00:00'),
+)
+
+
+def _csv_text(fields, rows):
+    """Render a header and rows as CSV text for Path.write_text."""
+    buffer = io.StringIO()
+    # write_text translates "\n" to the platform newline itself
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(fields)
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def _load_json(path):
+    """Read a JSON file written by the pipeline."""
+    return orjson.loads(Path(path).read_bytes())
+
+
+@pytest.fixture(autouse=True)
+def _no_sleep(monkeypatch):
+    """Skip rate limiting and retry delays in every test of this module."""
+    monkeypatch.setattr("time.sleep", lambda *args, **kwargs: None)
+
 
 class TestE2EHubSpotImport:
     """End-to-end tests for HubSpot import pipeline."""
     
     @pytest.fixture
-    def test_environment(self):
+    def test_environment(self, tmp_path, monkeypatch):
         """Set up test environment."""
-        temp_dir = tempfile.mkdtemp()
-        original_cwd = os.getcwd()
-        
         # Set test mode environment variable
-        os.environ['HUBSPOT_IMPORT_TEST_MODE'] = '1'
+        monkeypatch.setenv('HUBSPOT_IMPORT_TEST_MODE', '1')
         
         dirs = [
             "data/site_content/raw",
@@ -47,120 +84,51 @@ class TestE2EHubSpotImport:
             "logs"
         ]
         for d in dirs:
-            os.makedirs(os.path.join(temp_dir, d), exist_ok=True)
-        
-        os.chdir(temp_dir)
-        yield temp_dir
+            (tmp_path / d).mkdir(parents=True, exist_ok=True)
         
-        # Cleanup
-        os.environ.pop('HUBSPOT_IMPORT_TEST_MODE', None)
-        os.chdir(original_cwd)
-        shutil.rmtree(temp_dir)
+        # pytest restores the environment and working directory afterwards
+        monkeypatch.chdir(tmp_path)
+        return str(tmp_path)
     
     @pytest.fixture
     def sample_csv_files(self, test_environment):
         """Create sample CSV files for testing."""
-        # Create company CSV
         company_csv = Path("output/companies_test.csv")
-        with open(company_csv, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=[
-                'domain', 'business_type', 'naics_code', 'success', 
-                'enriched_at', 'confidence_score'
-            ])
-            writer.writeheader()
-            writer.writerow({
-                'domain': 'techcorp.com',
-                'business_type': 'Software Development',
-                'naics_code': '541511',
-                'success': 'true',
-                'enriched_at': '2024-01-01T00:00:00',
-                'confidence_score': '0.9'
-            })
-            writer.writerow({
-                'domain': 'retailco.com',
-                'business_type': 'E-commerce Retail',
-                'naics_code': '454110',
-                'success': 'true',
-                'enriched_at': '2024-01-01T00:00:00',
-                'confidence_score': '0.85'
-            })
-        
-        # Create leads CSV
+        company_csv.write_text(_csv_text(_COMPANY_FIELDS, _COMPANY_ROWS))
+        
         leads_csv = Path("output/leads_test.csv")
-        with open(leads_csv, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=[
-                'email', 'first_name', 'last_name', 'company_domain',
-                'buyer_persona', 'lead_score_adjustment', 'enriched_at'
-            ])
-            writer.writeheader()
-            writer.writerow({
-                'email': 'john.doe@techcorp.com',
-                'first_name': 'John',
-                'last_name': 'Doe',
-                'company_domain': 'techcorp.com',
-                'buyer_persona': 'Technical Decision Maker',
-                'lead_score_adjustment': '50',
-                'enriched_at': '2024-01-01T00:00:00'
-            })
-            writer.writerow({
-                'email': 'jane.smith@retailco.com',
-                'first_name': 'Jane',
-                'last_name': 'Smith',
-                'company_domain': 'retailco.com',
-                'buyer_persona': 'Business Decision Maker',
-                'lead_score_adjustment': '40',
-                'enriched_at': '2024-01-01T00:00:00'
-            })
+        leads_csv.write_text(_csv_text(_LEAD_FIELDS, _LEAD_ROWS))
         
+        # Markers the import tasks write next to each CSV
         return {
             'company_csv': str(company_csv),
-            'leads_csv': str(leads_csv)
+            'leads_csv': str(leads_csv),
+            'company_marker': str(company_csv.parent / ".imported_companies_test.json"),
+            'leads_marker': str(leads_csv.parent / ".imported_leads_test.json"),
+            'all_marker': str(company_csv.parent / ".imported_all_companies_test.json")
         }
     
-    def test_bulk_import_companies_only(self, sample_csv_files):
-        """Test bulk import of companies only."""
+    @pytest.mark.parametrize("csv_key,object_type,marker_key", [
+        ('company_csv', 'companies', 'company_marker'),
+        ('leads_csv', 'contacts', 'leads_marker'),
+    ])
+    def test_bulk_import_single(self, sample_csv_files, csv_key, object_type, marker_key):
+        """Test bulk import of companies only and of leads only."""
         # Run import task
         task = HubSpotBulkImportTask(
-            csv_file=sample_csv_files['company_csv'],
-            object_type='companies',
+            csv_file=sample_csv_files[csv_key],
+            object_type=object_type,
             hubspot_token='test-token'
         )
         
-        with patch('time.sleep'):  # Skip rate limiting
-            luigi.build([task], local_scheduler=True)
-        
-        # Verify import marker was created
-        marker_path = Path(sample_csv_files['company_csv']).parent / f".imported_companies_test.json"
-        assert marker_path.exists()
-        
-        # Verify import results
-        with open(marker_path) as f:
-            results = json.load(f)
-        
-        assert results['status'] == 'completed'
-        assert results['imported'] == 2
-        assert results['updated'] == 0
-        assert results['failed'] == 0
-    
-    def test_bulk_import_leads_only(self, sample_csv_files):
-        """Test bulk import of leads only."""
-        # Run import task
-        task = HubSpotBulkImportTask(
-            csv_file=sample_csv_files['leads_csv'],
-            object_type='contacts',
-            hubspot_token='test-token'
-        )
-        
-        with patch('time.sleep'):
-            luigi.build([task], local_scheduler=True)
+        luigi.build([task], local_scheduler=True)
         
         # Verify import marker was created
-        marker_path = Path(sample_csv_files['leads_csv']).parent / f".imported_leads_test.json"
+        marker_path = Path(sample_csv_files[marker_key])
         assert marker_path.exists()
         
         # Verify import results
-        with open(marker_path) as f:
-            results = json.load(f)
+        results = _load_json(marker_path)
         
         assert results['status'] == 'completed'
         assert results['imported'] == 2
@@ -176,16 +144,14 @@ class TestE2EHubSpotImport:
             hubspot_token='test-token'
         )
         
-        with patch('time.sleep'):
-            luigi.build([task], local_scheduler=True)
+        luigi.build([task], local_scheduler=True)
         
         # Verify combined marker was created
-        marker_path = Path(sample_csv_files['company_csv']).parent / ".imported_all_companies_test.json"
+        marker_path = Path(sample_csv_files['all_marker'])
         assert marker_path.exists()
         
         # Verify combined results
-        with open(marker_path) as f:
-            results = json.load(f)
+        results = _load_json(marker_path)
         
         assert results['status'] == 'completed'
         assert 'companies' in results
@@ -194,10 +160,13 @@ class TestE2EHubSpotImport:
         assert results['companies']['imported'] == 2
         assert results['leads']['imported'] == 2
     
-    def test_import_with_existing_records(self, sample_csv_files):
+    def test_import_with_existing_records(self, sample_csv_files, monkeypatch):
         """Test import with some existing records (should update instead of create)."""
-        # Modify test client to simulate existing records
-        os.environ['HUBSPOT_TEST_EXISTING_DOMAIN'] = 'techcorp.com'
+        # Seed the test client with an existing company
+        monkeypatch.setattr(
+            HubSpotBulkImportTask, '_get_test_client',
+            lambda self: _FakeHubSpotClient(existing_ids={'techcorp.com'})
+        )
         
         # Run import task
         task = HubSpotBulkImportTask(
@@ -206,21 +175,15 @@ class TestE2EHubSpotImport:
             hubspot_token='test-token'
         )
         
-        with patch('time.sleep'):
-            luigi.build([task], local_scheduler=True)
+        luigi.build([task], local_scheduler=True)
         
         # Verify results show update
-        marker_path = Path(sample_csv_files['company_csv']).parent / f".imported_companies_test.json"
-        with open(marker_path) as f:
-            results = json.load(f)
+        marker_path = Path(sample_csv_files['company_marker'])
+        results = _load_json(marker_path)
         
-        # In test mode, we can't differentiate updates vs creates
-        # Just verify it completed successfully
         assert results['status'] == 'completed'
-        assert results['imported'] + results['updated'] == 2
-        
-        # Cleanup
-        os.environ.pop('HUBSPOT_TEST_EXISTING_DOMAIN', None)
+        assert results['imported'] == 1
+        assert results['updated'] == 1
     
     def test_import_error_handling(self, sample_csv_files):
         """Test error handling during import."""
@@ -239,13 +202,11 @@ class TestE2EHubSpotImport:
             hubspot_token='test-token'
         )
         
-        with patch('time.sleep'):
-            luigi.build([task], local_scheduler=True)
+        luigi.build([task], local_scheduler=True)
         
         # Verify marker file shows partial success
         marker_path = error_csv.parent / f".imported_{error_csv.stem}.json"
-        with open(marker_path) as f:
-            results = json.load(f)
+        results = _load_json(marker_path)
         
         assert results['status'] == 'completed'
         assert results['imported'] == 1  # Only good.com should be imported
@@ -253,7 +214,7 @@ class TestE2EHubSpotImport:
     
     @patch('src.tasks.scrape.WebScraper')
     @patch('src.tasks.enrich.AIAnalyzer')
-    def test_full_pipeline_with_import(self, mock_analyzer_class, mock_scraper_class, test_environment):
+    def test_full_pipeline_with_import(self, mock_analyzer_class, mock_scraper_class, test_environment, analyze_leads_one_by_one):
         """Test full pipeline from scraping to HubSpot import."""
         # Mock scraper
         mock_scraper = Mock()
@@ -286,6 +247,7 @@ class TestE2EHubSpotImport:
                 "lead_score_adjustment": 50
             }
         ))
+        analyze_leads_one_by_one(mock_analyzer)
         mock_analyzer_class.return_value = mock_analyzer
         
         # Create domain file
@@ -298,23 +260,20 @@ class TestE2EHubSpotImport:
             hubspot_token='test-token'
         )
         
-        with patch('time.sleep'):
-            pipeline.process_domains_from_file(
-                "domains.txt",
-                "output",
-                use_celery=False,
-                import_to_hubspot=True
-            )
+        company_csv, leads_csv = pipeline.process_domains_from_file(
+            "domains.txt",
+            "output",
+            use_celery=False,
+            import_to_hubspot=True
+        )
         
         # Verify CSV files were created
-        company_csv = list(Path("output").glob("companies_*.csv"))
-        leads_csv = list(Path("output").glob("leads_*.csv"))
-        assert len(company_csv) > 0
-        assert len(leads_csv) > 0
-        
-        # Verify import markers were created
-        import_markers = list(Path("output").glob(".imported_*.json"))
-        assert len(import_markers) > 0
+        assert Path(company_csv).is_file()
+        assert Path(leads_csv).is_file()
+        
+        # Verify the combined import marker was created
+        company_path = Path(company_csv)
+        assert (company_path.parent / f".imported_all_{company_path.stem}.json").is_file()
     
     def test_import_without_token(self, sample_csv_files):
         """Test import behavior when no token is provided."""
@@ -328,9 +287,8 @@ class TestE2EHubSpotImport:
         luigi.build([task], local_scheduler=True)
         
         # Verify marker shows skipped status
-        marker_path = Path(sample_csv_files['company_csv']).parent / f".imported_companies_test.json"
-        with open(marker_path) as f:
-            results = json.load(f)
+        marker_path = Path(sample_csv_files['company_marker'])
+        results = _load_json(marker_path)
         
         assert results['status'] == 'skipped'
         assert results['reason'] == 'no_token'
@@ -354,8 +312,7 @@ class TestE2EHubSpotImport:
         
         # Verify marker shows no imports
         marker_path = empty_csv.parent / f".imported_{empty_csv.stem}.json"
-        with open(marker_path) as f:
-            results = json.load(f)
+        results = _load_json(marker_path)
         
         assert results['status'] == 'completed'
         assert results['imported'] == 0
\ No newline at end of file
@@ -2,14 +2,12 @@
 
 import pytest
 import json
-import os
 import time
 from pathlib import Path
-import tempfile
-import shutil
 from unittest.mock import patch, Mock
 import luigi
 import logging
+import orjson
 
 # Disable Luigi logging during tests
 logging.getLogger("luigi").setLevel(logging.ERROR)
@@ -19,6 +17,11 @@ from src.tasks.export import ExportAllCSVTask
 from src.models.enrichment import CompanyAnalysis, LeadAnalysis
 
 
+def _load_json(path):
+    """Read a JSON file written by the pipeline."""
+    return orjson.loads(Path(path).read_bytes())
+
+
 class TestE2EPipeline:
     """End-to-end tests for the domain enrichment pipeline."""
     
@@ -36,12 +39,8 @@ class TestE2EPipeline:
     ]
     
     @pytest.fixture
-    def test_environment(self):
+    def test_environment(self, tmp_path, monkeypatch):
         """Set up test environment."""
-        # Create temporary directory
-        temp_dir = tempfile.mkdtemp()
-        original_cwd = os.getcwd()
-        
         # Create directory structure
         dirs = [
             "data/site_content/raw",
@@ -51,16 +50,11 @@ class TestE2EPipeline:
             "logs"
         ]
         for d in dirs:
-            os.makedirs(os.path.join(temp_dir, d), exist_ok=True)
+            (tmp_path / d).mkdir(parents=True, exist_ok=True)
         
-        # Change to temp directory
-        os.chdir(temp_dir)
-        
-        yield temp_dir
-        
-        # Cleanup
-        os.chdir(original_cwd)
-        shutil.rmtree(temp_dir)
+        # Change to temp directory; pytest changes back afterwards
+        monkeypatch.chdir(tmp_path)
+        return str(tmp_path)
     
     @pytest.fixture
     def mock_scraper(self):
@@ -154,7 +148,7 @@ class TestE2EPipeline:
     @patch('src.tasks.scrape.WebScraper')
     @patch('src.tasks.enrich.AIAnalyzer')
     def test_single_domain_pipeline(self, mock_analyzer_class, mock_scraper_class, 
-                                   test_environment, mock_scraper, mock_analyzer):
+                                   test_environment, mock_scraper, mock_analyzer, analyze_leads_one_by_one):
         """Test pipeline with a single domain."""
         # Setup mocks
         mock_scraper_instance = Mock()
@@ -166,6 +160,7 @@ class TestE2EPipeline:
         # Bind the methods to the mock instance with correct signatures
         mock_analyzer_instance.analyze_company = lambda content, domain=None, emails=None: company_analysis(mock_analyzer_instance, Mock(content=content))
         mock_analyzer_instance.analyze_lead = lambda content, lead_info: lead_analysis(mock_analyzer_instance, Mock(content=content), lead_info)
+        analyze_leads_one_by_one(mock_analyzer_instance)
         mock_analyzer_class.return_value = mock_analyzer_instance
         
         # Run pipeline for single domain
@@ -184,8 +179,7 @@ class TestE2EPipeline:
         scraped_file = Path(f"data/site_content/raw/{domain}.json")
         assert scraped_file.exists()
         
-        with open(scraped_file) as f:
-            scraped_data = json.load(f)
+        scraped_data = _load_json(scraped_file)
         assert scraped_data["success"] is True
         assert scraped_data["domain"] == domain
         
@@ -193,8 +187,7 @@ class TestE2EPipeline:
         company_file = Path(f"data/enriched_companies/raw/{domain}.json")
         assert company_file.exists()
         
-        with open(company_file) as f:
-            company_data = json.load(f)
+        company_data = _load_json(company_file)
         assert company_data["success"] is True
         assert company_data["analysis"] is not None
         
@@ -202,8 +195,7 @@ class TestE2EPipeline:
         leads_file = Path(f"data/enriched_leads/raw/{domain}.json")
         assert leads_file.exists(), f"Leads file {leads_file} does not exist"
         
-        with open(leads_file) as f:
-            leads_data = json.load(f)
+        leads_data = _load_json(leads_file)
         
         # Check that leads were processed correctly
         assert "leads" in leads_data, f"Missing 'leads' key in data: {leads_data.keys()}"
@@ -214,7 +206,7 @@ class TestE2EPipeline:
     @patch('src.tasks.scrape.WebScraper')
     @patch('src.tasks.enrich.AIAnalyzer')
     def test_multiple_domains_pipeline(self, mock_analyzer_class, mock_scraper_class,
-                                      test_environment, mock_scraper, mock_analyzer):
+                                      test_environment, mock_scraper, mock_analyzer, analyze_leads_one_by_one):
         """Test pipeline with multiple domains."""
         # Setup mocks
         mock_scraper_instance = Mock()
@@ -226,6 +218,7 @@ class TestE2EPipeline:
         # Bind the methods to the mock instance with correct signatures
         mock_analyzer_instance.analyze_company = lambda content, domain=None, emails=None: company_analysis(mock_analyzer_instance, Mock(content=content))
         mock_analyzer_instance.analyze_lead = lambda content, lead_info: lead_analysis(mock_analyzer_instance, Mock(content=content), lead_info)
+        analyze_leads_one_by_one(mock_analyzer_instance)
         mock_analyzer_class.return_value = mock_analyzer_instance
         
         # Use first 5 test domains
@@ -238,7 +231,9 @@ class TestE2EPipeline:
         
         # Run pipeline
         pipeline = DomainPipeline(use_celery=False)
-        pipeline.process_domains_from_file("test_domains.txt", "output", use_celery=False)
+        company_csv, leads_csv = pipeline.process_domains_from_file(
+            "test_domains.txt", "output", use_celery=False
+        )
         
         # Verify all domains were processed
         for domain in test_domains:
@@ -255,8 +250,8 @@ class TestE2EPipeline:
             assert leads_file.exists(), f"Leads file missing for {domain}"
         
         # Check CSV outputs exist
-        csv_files = list(Path("output").glob("*.csv"))
-        assert len(csv_files) >= 2  # Should have companies and leads CSVs
+        assert Path(company_csv).is_file()
+        assert Path(leads_csv).is_file()
     
     @patch('src.tasks.scrape.WebScraper')
     def test_pipeline_error_handling(self, mock_scraper_class, test_environment):
@@ -293,8 +288,7 @@ class TestE2EPipeline:
             scraped_file = Path(f"data/site_content/raw/{domain}.json")
             assert scraped_file.exists()
             
-            with open(scraped_file) as f:
-                data = json.load(f)
+            data = _load_json(scraped_file)
             assert data["success"] is True
         
         # Check that failed domains have error files
@@ -302,8 +296,7 @@ class TestE2EPipeline:
             scraped_file = Path(f"data/site_content/raw/{domain}.json")
             assert scraped_file.exists()
             
-            with open(scraped_file) as f:
-                data = json.load(f)
+            data = _load_json(scraped_file)
             assert data["success"] is False
             assert "error" in data
     
@@ -155,7 +155,7 @@ class TestE2EPipelineEdgeCases:
     
     @patch('src.tasks.scrape.WebScraper')
     @patch('src.tasks.enrich.AIAnalyzer')
-    def test_very_large_content(self, mock_analyzer_class, mock_scraper_class, test_environment):
+    def test_very_large_content(self, mock_analyzer_class, mock_scraper_class, test_environment, analyze_leads_one_by_one):
         """Test handling of very large scraped content."""
         # Create scraper that returns very large content
         def large_content_scraper(domain):
@@ -206,6 +206,7 @@ class TestE2EPipelineEdgeCases:
                 }
             )
         )
+        analyze_leads_one_by_one(mock_analyzer_instance)
         mock_analyzer_class.return_value = mock_analyzer_instance
         
         with open("large_content_domains.txt", "w") as f:
@@ -227,7 +228,7 @@ class TestE2EPipelineEdgeCases:
     
     @patch('src.tasks.scrape.WebScraper')
     @patch('src.tasks.enrich.AIAnalyzer')
-    def test_special_characters_in_content(self, mock_analyzer_class, mock_scraper_class, test_environment):
+    def test_special_characters_in_content(self, mock_analyzer_class, mock_scraper_class, test_environment, analyze_leads_one_by_one):
         """Test handling of special characters and encodings."""
         def special_char_scraper(domain):
             special_contents = {
@@ -266,6 +267,7 @@ class TestE2EPipelineEdgeCases:
                 model_dump=lambda: {"buyer_persona": "Contact", "lead_score_adjustment": 25}
             )
         )
+        analyze_leads_one_by_one(mock_analyzer_instance)
         mock_analyzer_class.return_value = mock_analyzer_instance
         
         domains = ["special-chars.com", "emoji-site.com", "mixed-encoding.com", "html-entities.com"]
@@ -347,7 +349,7 @@ class TestE2EPipelineEdgeCases:
     
     @patch('src.tasks.scrape.WebScraper')
     @patch('src.tasks.enrich.AIAnalyzer')
-    def test_partial_pipeline_failure(self, mock_analyzer_class, mock_scraper_class, test_environment):
+    def test_partial_pipeline_failure(self, mock_analyzer_class, mock_scraper_class, test_environment, analyze_leads_one_by_one):
         """Test pipeline behavior when some stages fail."""
         # Scraper succeeds
         mock_scraper_instance = Mock()
@@ -374,6 +376,7 @@ class TestE2EPipelineEdgeCases:
                 model_dump=lambda: {"buyer_persona": "Contact", "lead_score_adjustment": 25}
             )
         )
+        analyze_leads_one_by_one(mock_analyzer_instance)
         mock_analyzer_class.return_value = mock_analyzer_instance
         
         with open("partial_failure_domains.txt", "w") as f:
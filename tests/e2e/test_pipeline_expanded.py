@@ -18,7 +18,7 @@ logging.getLogger("luigi").setLevel(logging.ERROR)
 
 from src.pipeline import DomainPipeline
 from src.tasks.scrape import ScrapeWebsiteTask
-from src.tasks.enrich import EnrichCompanyTask, EnrichLeadsTask
+from src.tasks.enrich import EnrichDomainTask, EnrichCompanyTask, EnrichLeadsTask
 from src.tasks.export import ExportCompanyCSVTask, ExportLeadsCSVTask
 from src.models.enrichment import ScrapedContent, CompanyAnalysis
 from src.utils.performance_monitor import PerformanceMonitor
@@ -210,7 +210,7 @@ class TestE2EPipelineExpanded:
     @patch('src.tasks.scrape.WebScraper')
     @patch('src.tasks.enrich.AIAnalyzer')
     def test_requests_vs_selenium_fallback(self, mock_analyzer_class, mock_scraper_class,
-                                          test_environment, realistic_scraper, industry_specific_analyzer):
+                                          test_environment, realistic_scraper, industry_specific_analyzer, analyze_leads_one_by_one):
         """Test that requests-first approach works and falls back to Selenium when needed."""
         # Mock the requests scraper to fail for JS-heavy sites
         mock_scraper_instance = Mock()
@@ -238,6 +238,7 @@ class TestE2EPipelineExpanded:
         company_analysis, lead_analysis = industry_specific_analyzer
         mock_analyzer_instance.analyze_company = lambda content: company_analysis(mock_analyzer_instance, content)
         mock_analyzer_instance.analyze_lead = lambda content, lead_info: lead_analysis(mock_analyzer_instance, content, lead_info)
+        analyze_leads_one_by_one(mock_analyzer_instance)
         mock_analyzer_class.return_value = mock_analyzer_instance
         
         # Test with JS-heavy site
@@ -261,7 +262,7 @@ class TestE2EPipelineExpanded:
     @patch('src.tasks.scrape.WebScraper')
     @patch('src.tasks.enrich.AIAnalyzer')
     def test_csv_export_formats(self, mock_analyzer_class, mock_scraper_class,
-                               test_environment, realistic_scraper, industry_specific_analyzer):
+                               test_environment, realistic_scraper, industry_specific_analyzer, analyze_leads_one_by_one):
         """Test that CSV exports have correct format for HubSpot import."""
         # Setup mocks
         mock_scraper_instance = Mock()
@@ -272,6 +273,7 @@ class TestE2EPipelineExpanded:
         company_analysis, lead_analysis = industry_specific_analyzer
         mock_analyzer_instance.analyze_company = lambda content: company_analysis(mock_analyzer_instance, content)
         mock_analyzer_instance.analyze_lead = lambda content, lead_info: lead_analysis(mock_analyzer_instance, content, lead_info)
+        analyze_leads_one_by_one(mock_analyzer_instance)
         mock_analyzer_class.return_value = mock_analyzer_instance
         
         # Process domains with different characteristics
@@ -328,7 +330,7 @@ class TestE2EPipelineExpanded:
     @patch('src.tasks.scrape.WebScraper')
     @patch('src.tasks.enrich.AIAnalyzer')
     def test_performance_monitoring(self, mock_analyzer_class, mock_scraper_class,
-                                   test_environment, realistic_scraper, industry_specific_analyzer):
+                                   test_environment, realistic_scraper, industry_specific_analyzer, analyze_leads_one_by_one):
         """Test that performance monitoring tracks metrics correctly."""
         # Import performance monitor
         from src.utils.performance_monitor import get_performance_monitor
@@ -361,6 +363,7 @@ class TestE2EPipelineExpanded:
         company_analysis, lead_analysis = industry_specific_analyzer
         mock_analyzer_instance.analyze_company = lambda content: company_analysis(mock_analyzer_instance, content)
         mock_analyzer_instance.analyze_lead = lambda content, lead_info: lead_analysis(mock_analyzer_instance, content, lead_info)
+        analyze_leads_one_by_one(mock_analyzer_instance)
         mock_analyzer_class.return_value = mock_analyzer_instance
         
         # Process multiple domains
@@ -381,7 +384,7 @@ class TestE2EPipelineExpanded:
     @patch('src.tasks.scrape.WebScraper')
     @patch('src.tasks.enrich.AIAnalyzer')
     def test_international_content_handling(self, mock_analyzer_class, mock_scraper_class,
-                                           test_environment, realistic_scraper, industry_specific_analyzer):
+                                           test_environment, realistic_scraper, industry_specific_analyzer, analyze_leads_one_by_one):
         """Test handling of international/unicode content."""
         # Setup mocks
         mock_scraper_instance = Mock()
@@ -392,6 +395,7 @@ class TestE2EPipelineExpanded:
         company_analysis, lead_analysis = industry_specific_analyzer
         mock_analyzer_instance.analyze_company = lambda content: company_analysis(mock_analyzer_instance, content)
         mock_analyzer_instance.analyze_lead = lambda content, lead_info: lead_analysis(mock_analyzer_instance, content, lead_info)
+        analyze_leads_one_by_one(mock_analyzer_instance)
         mock_analyzer_class.return_value = mock_analyzer_instance
         
         # Process international domain
@@ -413,7 +417,7 @@ class TestE2EPipelineExpanded:
     @patch('src.tasks.scrape.WebScraper')
     @patch('src.tasks.enrich.AIAnalyzer')
     def test_email_extraction_patterns(self, mock_analyzer_class, mock_scraper_class,
-                                      test_environment, realistic_scraper, industry_specific_analyzer):
+                                      test_environment, realistic_scraper, industry_specific_analyzer, analyze_leads_one_by_one):
         """Test various email extraction patterns."""
         # Create custom scraper for email testing
         def email_test_scraper(domain):
@@ -460,6 +464,7 @@ class TestE2EPipelineExpanded:
         company_analysis, lead_analysis = industry_specific_analyzer
         mock_analyzer_instance.analyze_company = lambda content: company_analysis(mock_analyzer_instance, content)
         mock_analyzer_instance.analyze_lead = lambda content, lead_info: lead_analysis(mock_analyzer_instance, content, lead_info)
+        analyze_leads_one_by_one(mock_analyzer_instance)
         mock_analyzer_class.return_value = mock_analyzer_instance
         
         # Process test domain
@@ -535,7 +540,7 @@ class TestE2EPipelineExpanded:
     @patch('src.tasks.scrape.WebScraper')
     @patch('src.tasks.enrich.AIAnalyzer')
     def test_concurrent_pipeline_execution(self, mock_analyzer_class, mock_scraper_class,
-                                          test_environment, realistic_scraper, industry_specific_analyzer):
+                                          test_environment, realistic_scraper, industry_specific_analyzer, analyze_leads_one_by_one):
         """Test pipeline with concurrent execution (simulated)."""
         # Setup mocks
         mock_scraper_instance = Mock()
@@ -546,6 +551,7 @@ class TestE2EPipelineExpanded:
         company_analysis, lead_analysis = industry_specific_analyzer
         mock_analyzer_instance.analyze_company = lambda content: company_analysis(mock_analyzer_instance, content)
         mock_analyzer_instance.analyze_lead = lambda content, lead_info: lead_analysis(mock_analyzer_instance, content, lead_info)
+        analyze_leads_one_by_one(mock_analyzer_instance)
         mock_analyzer_class.return_value = mock_analyzer_instance
         
         # Process many domains
@@ -585,12 +591,14 @@ class TestE2EPipelineExpanded:
         
         # Create tasks
         scrape_task = ScrapeWebsiteTask(domain=domain)
+        domain_task = EnrichDomainTask(domain=domain)
         company_task = EnrichCompanyTask(domain=domain)
         leads_task = EnrichLeadsTask(domain=domain)
         
-        # Check dependencies
-        assert company_task.requires() == scrape_task
-        assert leads_task.requires() == scrape_task
+        # Check dependencies - both enrichments share one read of the scrape
+        assert domain_task.requires() == scrape_task
+        assert company_task.requires() == domain_task
+        assert leads_task.requires() == domain_task
         
         # Export tasks should depend on enrichment
         company_csv_task = ExportCompanyCSVTask(
@@ -111,6 +111,22 @@ class TestServicesIntegration:
         # The functionality is already tested through E2E tests
         pass
     
+    def test_concurrent_enrichment_sizes_pool_from_rate_limits(self):
+        """Test an unset worker count sizes the pool from the API rate limits."""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        service = ConcurrentEnrichmentService(scraping_depth=0)
+        
+        with patch('src.utils.multiprocessing_manager.ThreadPoolExecutor', wraps=ThreadPoolExecutor) as mock_executor, \
+             patch('src.utils.multiprocessing_manager.rate_limit_manager.acquire', return_value=0), \
+             patch.object(service, 'enrich_domain_with_rate_limit', side_effect=lambda domain: {"domain": domain}):
+            results, errors = service.enrich_domains(["a.com", "b.com"])
+        
+        assert len(results) == 2
+        assert errors == []
+        # deepseek's 2 calls/s is the stricter limit: 2 * ITEM_LATENCY_SECONDS workers
+        assert mock_executor.call_args.kwargs['max_workers'] == 10
+    
     def test_hubspot_service_error_handling(self):
         """Test HubSpot service error handling."""
         # Skip this test as it requires complex mocking of dynamically imported modules
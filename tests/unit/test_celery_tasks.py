@@ -34,6 +34,14 @@ class TestCeleryTaskLogic:
         os.chdir(original_cwd)
         shutil.rmtree(temp_dir)
     
+    @staticmethod
+    def _mock_luigi_task(requires=None):
+        """Create a mock Luigi task that completes once run."""
+        mock_task = Mock()
+        mock_task.complete.side_effect = [False, True]
+        mock_task.requires.return_value = requires or []
+        return mock_task
+    
     def test_luigi_celery_task_base(self, test_environment):
         """Test LuigiCeleryTask base class logic."""
         from src.tasks.celery_tasks import LuigiCeleryTask
@@ -41,14 +49,42 @@ class TestCeleryTaskLogic:
         # Create instance
         task = LuigiCeleryTask()
         
-        # Test successful Luigi task execution
-        mock_luigi_task = Mock()
+        # Test successful Luigi task execution without a Luigi scheduler
+        mock_luigi_task = self._mock_luigi_task()
         with patch('luigi.build') as mock_build:
-            mock_build.return_value = True
-            
             result = task.run_luigi_task(mock_luigi_task)
             assert result is True
-            mock_build.assert_called_once_with([mock_luigi_task], local_scheduler=True, log_level='WARNING')
+            mock_luigi_task.run.assert_called_once()
+            mock_build.assert_not_called()
+    
+    def test_luigi_celery_task_runs_dependencies(self, test_environment):
+        """Test LuigiCeleryTask runs incomplete dependencies first."""
+        from src.tasks.celery_tasks import LuigiCeleryTask
+        
+        task = LuigiCeleryTask()
+        
+        calls = []
+        dependency = self._mock_luigi_task()
+        dependency.run.side_effect = lambda: calls.append("dependency")
+        complete_dependency = Mock()
+        complete_dependency.complete.return_value = True
+        mock_luigi_task = self._mock_luigi_task(requires=[dependency, complete_dependency])
+        mock_luigi_task.run.side_effect = lambda: calls.append("task")
+        
+        assert task.run_luigi_task(mock_luigi_task) is True
+        assert calls == ["dependency", "task"]
+        complete_dependency.run.assert_not_called()
+    
+    def test_luigi_celery_task_skips_complete_task(self, test_environment):
+        """Test LuigiCeleryTask does not rerun a complete task."""
+        from src.tasks.celery_tasks import LuigiCeleryTask
+        
+        task = LuigiCeleryTask()
+        mock_luigi_task = Mock()
+        mock_luigi_task.complete.return_value = True
+        
+        assert task.run_luigi_task(mock_luigi_task) is True
+        mock_luigi_task.run.assert_not_called()
     
     def test_luigi_celery_task_error_handling(self, test_environment):
         """Test LuigiCeleryTask error handling."""
@@ -58,25 +94,78 @@ class TestCeleryTaskLogic:
         task = LuigiCeleryTask()
         
         # Test failed Luigi task execution
+        mock_luigi_task = self._mock_luigi_task()
+        mock_luigi_task.run.side_effect = Exception("Test error")
+        
+        with pytest.raises(Exception, match="Test error"):
+            task.run_luigi_task(mock_luigi_task)
+    
+    def test_run_and_report_result(self, test_environment):
+        """Test run_and_report builds the standard result dict."""
+        from src.tasks.celery_tasks import LuigiCeleryTask
+        
+        task = LuigiCeleryTask()
+        mock_luigi_task = self._mock_luigi_task()
+        mock_luigi_task.output.return_value.path = "data/site_content/raw/test.com.json"
+        
+        result = task.run_and_report(mock_luigi_task, "scrape", domain="test.com")
+        
+        assert result.pop("elapsed") >= 0
+        assert result == {
+            "domain": "test.com",
+            "task": "scrape",
+            "success": True,
+            "output_path": "data/site_content/raw/test.com.json"
+        }
+    
+    def test_run_and_report_incomplete(self, test_environment):
+        """Test run_and_report omits output paths when the task did not complete."""
+        from src.tasks.celery_tasks import LuigiCeleryTask
+        
+        task = LuigiCeleryTask()
         mock_luigi_task = Mock()
-        with patch('luigi.build') as mock_build:
-            mock_build.side_effect = Exception("Test error")
-            
-            with pytest.raises(Exception, match="Test error"):
-                task.run_luigi_task(mock_luigi_task)
+        mock_luigi_task.complete.return_value = False
+        
+        result = task.run_and_report(
+            mock_luigi_task,
+            "export_company_csv_batch",
+            outputs={"output_path": "companies.csv"},
+            domains=2
+        )
+        
+        assert result["success"] is False
+        assert result["output_path"] is None
+        assert result["domains"] == 2
+    
+    def test_run_and_report_failed_dependency(self, test_environment):
+        """Test an incomplete upstream task yields no output path."""
+        from src.tasks.celery_tasks import LuigiCeleryTask
+        
+        task = LuigiCeleryTask()
+        dependency = Mock()
+        dependency.complete.return_value = False
+        dependency.requires.return_value = []
+        mock_luigi_task = Mock()
+        mock_luigi_task.complete.return_value = False
+        mock_luigi_task.requires.return_value = [dependency]
+        mock_luigi_task.output.return_value.path = "data/enriched_companies/raw/test.com.json"
+        
+        result = task.run_and_report(mock_luigi_task, "enrich_company", domain="test.com")
+        
+        assert result["success"] is False
+        assert result["output_path"] is None
+        mock_luigi_task.run.assert_not_called()
     
     @patch('src.tasks.scrape.ScrapeWebsiteTask')
-    @patch('luigi.build')
-    def test_scrape_domain_logic(self, mock_build, mock_scrape_task, test_environment):
+    def test_scrape_domain_logic(self, mock_scrape_task, test_environment):
         """Test scrape domain task logic."""
         # Import the function directly to avoid Celery infrastructure
         from src.tasks.celery_tasks import LuigiCeleryTask
         
         # Setup mocks
-        mock_task_instance = Mock()
+        mock_task_instance = self._mock_luigi_task()
         mock_task_instance.output.return_value.path = "data/site_content/raw/test.com.json"
         mock_scrape_task.return_value = mock_task_instance
-        mock_build.return_value = True
         
         # Create task instance and run logic
         task = LuigiCeleryTask()
@@ -85,20 +174,18 @@ class TestCeleryTaskLogic:
         
         # Verify
         assert success is True
-        mock_build.assert_called_once()
+        mock_task_instance.run.assert_called_once()
         mock_scrape_task.assert_called_once_with(domain="test.com")
     
     @patch('src.tasks.enrich.EnrichCompanyTask')
-    @patch('luigi.build')
-    def test_enrich_company_logic(self, mock_build, mock_enrich_task, test_environment):
+    def test_enrich_company_logic(self, mock_enrich_task, test_environment):
         """Test enrich company task logic."""
         from src.tasks.celery_tasks import LuigiCeleryTask
         
         # Setup mocks
-        mock_task_instance = Mock()
+        mock_task_instance = self._mock_luigi_task()
         mock_task_instance.output.return_value.path = "data/enriched_companies/raw/test.com.json"
         mock_enrich_task.return_value = mock_task_instance
-        mock_build.return_value = True
         
         # Create task instance and run logic
         task = LuigiCeleryTask()
@@ -107,20 +194,18 @@ class TestCeleryTaskLogic:
         
         # Verify
         assert success is True
-        mock_build.assert_called_once()
+        mock_task_instance.run.assert_called_once()
         mock_enrich_task.assert_called_once_with(domain="test.com")
     
     @patch('src.tasks.enrich.EnrichLeadsTask')
-    @patch('luigi.build')
-    def test_enrich_leads_logic(self, mock_build, mock_enrich_task, test_environment):
+    def test_enrich_leads_logic(self, mock_enrich_task, test_environment):
         """Test enrich leads task logic."""
         from src.tasks.celery_tasks import LuigiCeleryTask
         
         # Setup mocks
-        mock_task_instance = Mock()
+        mock_task_instance = self._mock_luigi_task()
         mock_task_instance.output.return_value.path = "data/enriched_leads/raw/test.com.json"
         mock_enrich_task.return_value = mock_task_instance
-        mock_build.return_value = True
         
         # Create task instance and run logic
         task = LuigiCeleryTask()
@@ -129,69 +214,29 @@ class TestCeleryTaskLogic:
         
         # Verify
         assert success is True
-        mock_build.assert_called_once()
+        mock_task_instance.run.assert_called_once()
         mock_enrich_task.assert_called_once_with(domain="test.com")
     
     def test_process_domain_pipeline_logic(self, test_environment):
-        """Test process_domain_pipeline task logic."""
-        # Test the pipeline logic by mocking the sub-tasks
+        """Test process_domain_pipeline submits the workflow without blocking."""
         with patch('src.tasks.celery_tasks.scrape_domain') as mock_scrape, \
-             patch('src.tasks.celery_tasks.enrich_company') as mock_enrich_company, \
-             patch('src.tasks.celery_tasks.enrich_leads') as mock_enrich_leads:
-            
-            # Setup mocks for successful execution
-            mock_scrape_result = Mock()
-            mock_scrape_result.successful.return_value = True
-            mock_scrape.apply.return_value = mock_scrape_result
-            
-            mock_company_result = Mock()
-            mock_company_result.successful.return_value = True
-            mock_enrich_company.apply.return_value = mock_company_result
+             patch('src.tasks.celery_tasks.enrich_domain') as mock_enrich_domain, \
+             patch('src.tasks.celery_tasks.chain') as mock_chain:
             
-            mock_leads_result = Mock()
-            mock_leads_result.successful.return_value = True
-            mock_enrich_leads.apply.return_value = mock_leads_result
+            mock_chain.return_value.apply_async.return_value = Mock(id="workflow-123")
             
-            # Import and execute the pipeline logic directly
             from src.tasks.celery_tasks import process_domain_pipeline
             
-            # Simulate the task execution logic
-            domain = "test.com"
-            company_csv = "companies.csv"
-            leads_csv = "leads.csv"
+            result = process_domain_pipeline("test.com", "companies.csv", "leads.csv")
             
-            # This would be the actual task logic
-            try:
-                # Step 1: Scrape the domain
-                scrape_result = mock_scrape.apply(args=[domain])
-                scrape_success = scrape_result.successful()
-                
-                # Step 2: Enrich company data
-                company_result = mock_enrich_company.apply(args=[domain])
-                company_success = company_result.successful()
-                
-                # Step 3: Enrich leads data  
-                leads_result = mock_enrich_leads.apply(args=[domain])
-                leads_success = leads_result.successful()
-                
-                result = {
-                    "domain": domain,
-                    "status": "completed",
-                    "scrape_success": scrape_success,
-                    "company_enrichment_success": company_success,
-                    "leads_enrichment_success": leads_success
-                }
-                
-            except Exception as e:
-                result = {
-                    "domain": domain,
-                    "status": "failed",
-                    "error": str(e)
-                }
+            # Verify immutable signatures were used for every step
+            mock_scrape.si.assert_called_once_with("test.com")
+            mock_enrich_domain.si.assert_called_once_with("test.com")
+            mock_chain.return_value.apply_async.assert_called_once_with()
             
             # Verify result
-            assert result['domain'] == 'test.com'
-            assert result['status'] == 'completed'
-            assert result['scrape_success'] is True
-            assert result['company_enrichment_success'] is True
-            assert result['leads_enrichment_success'] is True
\ No newline at end of file
+            assert result == {
+                "domain": "test.com",
+                "status": "submitted",
+                "workflow_id": "workflow-123"
+            }
@@ -63,8 +63,8 @@ class TestHubSpotBulkImportTask:
         expected_marker = Path(temp_csv).parent / f".imported_{Path(temp_csv).stem}.json"
         assert task.output().path == str(expected_marker)
     
-    @patch('src.tasks.hubspot_import.HubSpotBulkImportTask._read_csv_file')
-    def test_run_no_token(self, mock_read_csv):
+    @patch('src.tasks.hubspot_import.HubSpotBulkImportTask._iter_csv_file')
+    def test_run_no_token(self, mock_iter_csv):
         """Test run without HubSpot token."""
         task = HubSpotBulkImportTask(
             csv_file='test.csv',
@@ -85,31 +85,65 @@ class TestHubSpotBulkImportTask:
                     data = json.load(f)
                 assert data['status'] == 'skipped'
                 assert data['reason'] == 'no_token'
+                
+                # Written via a temporary file renamed into place
+                assert not Path(str(marker_path) + '.tmp').exists()
     
-    def test_read_csv_file(self, temp_csv):
+    def test_iter_csv_file(self, temp_csv):
         """Test reading CSV file."""
         task = HubSpotBulkImportTask(
             csv_file=temp_csv,
             object_type='companies'
         )
         
-        records = task._read_csv_file()
+        records = list(task._iter_csv_file())
         
         assert len(records) == 2
         assert records[0]['domain'] == 'test.com'
         assert records[0]['business_type'] == 'Tech'
         assert records[1]['domain'] == 'example.com'
     
-    def test_read_csv_file_not_found(self):
+    def test_iter_csv_file_skips_rows_without_key(self, tmp_path):
+        """Test rows without the object type's key column value are skipped."""
+        csv_file = tmp_path / 'leads.csv'
+        csv_file.write_text(
+            'email,first_name\n'
+            'john@test.com,John\n'
+            ' ,Jane\n'
+            '\n'
+            'bob@test.com,Bob\n'
+        )
+        task = HubSpotBulkImportTask(
+            csv_file=str(csv_file),
+            object_type='contacts'
+        )
+        
+        records = list(task._iter_csv_file())
+        
+        assert [r['email'] for r in records] == ['john@test.com', 'bob@test.com']
+    
+    def test_iter_csv_file_not_found(self):
         """Test reading non-existent CSV file."""
         task = HubSpotBulkImportTask(
             csv_file='nonexistent.csv',
             object_type='companies'
         )
         
-        records = task._read_csv_file()
+        records = list(task._iter_csv_file())
         assert records == []
     
+    def test_iter_csv_file_raises_on_read_error(self, tmp_path):
+        """Test a read error partway through the file is raised, not swallowed."""
+        csv_file = tmp_path / 'companies.csv'
+        csv_file.write_bytes(b'domain,business_type\ntest.com,Tech\nbad.com,\xff\n')
+        task = HubSpotBulkImportTask(
+            csv_file=str(csv_file),
+            object_type='companies'
+        )
+        
+        with pytest.raises(UnicodeDecodeError):
+            list(task._iter_csv_file())
+    
     def test_prepare_company_properties(self):
         """Test preparing company properties for HubSpot API."""
         task = HubSpotBulkImportTask(
@@ -165,18 +199,26 @@ class TestHubSpotBulkImportTask:
         assert properties['lead_score_adjustment'] == '50'
         assert properties['enrichment_status'] == 'completed'
     
-    @patch('common.clients.hubspot.HubSpotClient')
-    def test_import_companies_success(self, mock_client_class, temp_csv):
+    @staticmethod
+    def _read_errors(path):
+        """Read an import errors JSONL file."""
+        with open(path) as f:
+            return [json.loads(line) for line in f]
+    
+    @staticmethod
+    def _upsert_response(inputs, new=True):
+        """Build a batch upsert response for the given inputs."""
+        return {
+            'status': 'COMPLETE',
+            'results': [{'id': item['id'], 'new': new} for item in inputs]
+        }
+    
+    def test_import_companies_success(self, temp_csv):
         """Test successful company import."""
-        # Mock HubSpot client
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
-        
-        # Mock search - no existing companies
-        mock_client.search_companies.return_value = {'results': []}
-        
-        # Mock create company
-        mock_client.create_company.return_value = {'id': '12345'}
+        mock_client.batch_upsert_companies.side_effect = (
+            lambda inputs: self._upsert_response(inputs)
+        )
         
         task = HubSpotBulkImportTask(
             csv_file=temp_csv,
@@ -193,30 +235,57 @@ class TestHubSpotBulkImportTask:
             results = task._import_companies(mock_client, records)
         
         assert results['status'] == 'completed'
+        assert results['total'] == 2
         assert results['imported'] == 2
         assert results['updated'] == 0
         assert results['failed'] == 0
-        assert mock_client.create_company.call_count == 2
+        
+        # One batch request, matched by domain, and no per-record searches
+        mock_client.batch_upsert_companies.assert_called_once()
+        inputs = mock_client.batch_upsert_companies.call_args.kwargs['inputs']
+        assert [item['id'] for item in inputs] == ['test.com', 'example.com']
+        assert all(item['idProperty'] == 'domain' for item in inputs)
+        mock_client.search_companies.assert_not_called()
     
-    @patch('common.clients.hubspot.HubSpotClient')
-    def test_import_companies_with_existing(self, mock_client_class):
+    def test_import_companies_with_existing(self, tmp_path):
         """Test company import with existing companies."""
-        # Mock HubSpot client
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_client.batch_upsert_companies.return_value = {
+            'status': 'COMPLETE',
+            'results': [
+                {'id': '12345', 'new': False},
+                {'id': '67890', 'new': True}
+            ]
+        }
+        
+        task = HubSpotBulkImportTask(
+            csv_file=str(tmp_path / 'test.csv'),
+            object_type='companies',
+            hubspot_token='test-token'
+        )
         
-        # Mock search - find existing company
-        mock_client.search_companies.side_effect = [
-            {'results': [{'id': '12345', 'properties': {'domain': 'test.com'}}]},
-            {'results': []}
+        records = [
+            {'domain': 'test.com', 'business_type': 'Tech', 'success': 'true'},
+            {'domain': 'example.com', 'business_type': 'Retail', 'success': 'true'}
         ]
         
-        # Mock update company
-        mock_client.update_company.return_value = {'id': '12345'}
-        mock_client.create_company.return_value = {'id': '67890'}
+        with patch('time.sleep'):
+            results = task._import_companies(mock_client, records)
+        
+        assert results['imported'] == 1
+        assert results['updated'] == 1
+    
+    def test_import_companies_without_batch_upsert(self, tmp_path):
+        """Test clients without batch upserts fall back to per-record calls."""
+        mock_client = Mock(spec=['search_companies', 'create_company', 'update_company'])
+        mock_client.search_companies.side_effect = lambda **kwargs: (
+            {'results': [{'id': '12345'}]}
+            if kwargs['filter_groups'][0]['filters'][0]['value'] == 'test.com'
+            else {'results': []}
+        )
         
         task = HubSpotBulkImportTask(
-            csv_file='test.csv',
+            csv_file=str(tmp_path / 'test.csv'),
             object_type='companies',
             hubspot_token='test-token'
         )
@@ -231,24 +300,72 @@ class TestHubSpotBulkImportTask:
         
         assert results['imported'] == 1
         assert results['updated'] == 1
-        assert mock_client.update_company.call_count == 1
-        assert mock_client.create_company.call_count == 1
+        assert mock_client.update_company.call_args.kwargs['company_id'] == '12345'
+        mock_client.create_company.assert_called_once()
     
-    @patch('common.clients.hubspot.HubSpotClient')
-    def test_import_contacts_success(self, mock_client_class):
-        """Test successful contact import."""
-        # Mock HubSpot client
+    def test_import_companies_in_batches(self, tmp_path):
+        """Test company import splits records into batches of 100."""
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_client.batch_upsert_companies.side_effect = (
+            lambda inputs: self._upsert_response(inputs)
+        )
         
-        # Mock search - no existing contacts
-        mock_client.search_contacts.return_value = {'results': []}
+        task = HubSpotBulkImportTask(
+            csv_file=str(tmp_path / 'test.csv'),
+            object_type='companies',
+            hubspot_token='test-token'
+        )
+        
+        records = [
+            {'domain': f'site{i}.com', 'success': 'true'} for i in range(250)
+        ]
         
-        # Mock create contact
-        mock_client.create_contact.return_value = {'id': '12345'}
+        with patch('time.sleep'):
+            results = task._import_companies(mock_client, records)
+        
+        batch_sizes = [
+            len(c.kwargs['inputs'])
+            for c in mock_client.batch_upsert_companies.call_args_list
+        ]
+        assert sorted(batch_sizes) == [50, 100, 100]
+        assert results['imported'] == 250
+    
+    def test_import_companies_deduplicates_domains(self, tmp_path):
+        """Test repeated domains are sent once, keeping the last record."""
+        mock_client = Mock()
+        mock_client.batch_upsert_companies.side_effect = (
+            lambda inputs: self._upsert_response(inputs)
+        )
         
         task = HubSpotBulkImportTask(
-            csv_file='test.csv',
+            csv_file=str(tmp_path / 'test.csv'),
+            object_type='companies',
+            hubspot_token='test-token'
+        )
+        
+        records = [
+            {'domain': 'test.com', 'business_type': 'Old', 'success': 'true'},
+            {'domain': 'example.com', 'business_type': 'Retail', 'success': 'true'},
+            {'domain': 'Test.com', 'business_type': 'New', 'success': 'true'}
+        ]
+        
+        with patch('time.sleep'):
+            results = task._import_companies(mock_client, records)
+        
+        inputs = mock_client.batch_upsert_companies.call_args.kwargs['inputs']
+        assert [item['id'] for item in inputs] == ['Test.com', 'example.com']
+        assert inputs[0]['properties']['business_type_description'] == 'New'
+        assert results['imported'] == 2
+    
+    def test_import_contacts_success(self, tmp_path):
+        """Test successful contact import."""
+        mock_client = Mock()
+        mock_client.batch_upsert_contacts.side_effect = (
+            lambda inputs: self._upsert_response(inputs)
+        )
+        
+        task = HubSpotBulkImportTask(
+            csv_file=str(tmp_path / 'test.csv'),
             object_type='contacts',
             hubspot_token='test-token'
         )
@@ -275,26 +392,51 @@ class TestHubSpotBulkImportTask:
         assert results['imported'] == 2
         assert results['updated'] == 0
         assert results['failed'] == 0
-        assert mock_client.create_contact.call_count == 2
+        inputs = mock_client.batch_upsert_contacts.call_args.kwargs['inputs']
+        assert all(item['idProperty'] == 'email' for item in inputs)
+        mock_client.search_contacts.assert_not_called()
     
-    @patch('common.clients.hubspot.HubSpotClient')
-    def test_import_companies_with_errors(self, mock_client_class):
-        """Test company import with errors."""
-        # Mock HubSpot client
+    def test_import_contacts_in_batches(self, tmp_path):
+        """Test contact import splits records into batches of 100."""
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_client.batch_upsert_contacts.side_effect = (
+            lambda inputs: self._upsert_response(inputs)
+        )
         
-        # Mock search
-        mock_client.search_companies.return_value = {'results': []}
+        task = HubSpotBulkImportTask(
+            csv_file=str(tmp_path / 'test.csv'),
+            object_type='contacts',
+            hubspot_token='test-token'
+        )
         
-        # Mock create company - raise error for second company
-        mock_client.create_company.side_effect = [
-            {'id': '12345'},
-            Exception("API Error")
+        records = [
+            {'email': f'lead{i}@test.com', 'company_domain': 'test.com'}
+            for i in range(250)
         ]
         
+        with patch('time.sleep'):
+            results = task._import_contacts(mock_client, records)
+        
+        batch_sizes = [
+            len(c.kwargs['inputs'])
+            for c in mock_client.batch_upsert_contacts.call_args_list
+        ]
+        assert sorted(batch_sizes) == [50, 100, 100]
+        assert results['imported'] == 250
+    
+    def test_import_companies_with_errors(self, tmp_path):
+        """Test company import with errors."""
+        mock_client = Mock()
+        
+        # Second company rejected in a partial-success response
+        mock_client.batch_upsert_companies.return_value = {
+            'status': 'COMPLETE',
+            'results': [{'id': '12345', 'new': True}],
+            'errors': [{'message': 'API Error'}]
+        }
+        
         task = HubSpotBulkImportTask(
-            csv_file='test.csv',
+            csv_file=str(tmp_path / 'test.csv'),
             object_type='companies',
             hubspot_token='test-token'
         )
@@ -309,8 +451,65 @@ class TestHubSpotBulkImportTask:
         
         assert results['imported'] == 1
         assert results['failed'] == 1
-        assert len(results['errors']) == 1
-        assert 'API Error' in results['errors'][0]
+        
+        # Errors go to a JSONL file next to the marker
+        errors = self._read_errors(results['errors_file'])
+        assert len(errors) == 1
+        assert errors[0]['error'] == 'API Error'
+        assert errors[0]['object'] == 'company'
+    
+    def test_import_companies_batch_request_fails(self, tmp_path):
+        """Test a failed batch request marks all of its records failed."""
+        mock_client = Mock()
+        mock_client.batch_upsert_companies.side_effect = Exception("API Error")
+        
+        task = HubSpotBulkImportTask(
+            csv_file=str(tmp_path / 'test.csv'),
+            object_type='companies',
+            hubspot_token='test-token'
+        )
+        
+        records = [
+            {'domain': 'test.com', 'success': 'true'},
+            {'domain': 'example.com', 'success': 'true'}
+        ]
+        
+        with patch('time.sleep'):
+            results = task._import_companies(mock_client, records)
+        
+        assert results['imported'] == 0
+        assert results['failed'] == 2
+        errors = self._read_errors(results['errors_file'])
+        assert errors == [
+            {'object': 'company', 'key': 'test.com..example.com', 'error': 'API Error'}
+        ]
+    
+    def test_import_companies_retries_rate_limited_batch(self, tmp_path):
+        """Test a 429 batch is retried after its Retry-After delay."""
+        rate_limited = Exception("Too Many Requests")
+        rate_limited.response = Mock(status_code=429, headers={'Retry-After': '2'})
+        
+        mock_client = Mock()
+        mock_client.batch_upsert_companies.side_effect = [
+            rate_limited,
+            {'status': 'COMPLETE', 'results': [{'id': '12345', 'new': True}]}
+        ]
+        
+        task = HubSpotBulkImportTask(
+            csv_file=str(tmp_path / 'test.csv'),
+            object_type='companies',
+            hubspot_token='test-token'
+        )
+        
+        with patch('time.sleep') as mock_sleep:
+            results = task._import_companies(
+                mock_client, [{'domain': 'test.com', 'success': 'true'}]
+            )
+        
+        mock_sleep.assert_any_call(2.0)
+        assert mock_client.batch_upsert_companies.call_count == 2
+        assert results['imported'] == 1
+        assert results['failed'] == 0
     
     def test_find_company_by_domain(self):
         """Test finding company by domain."""
@@ -355,6 +554,23 @@ class TestHubSpotBulkImportTask:
         mock_client.search_contacts.return_value = {'results': []}
         result = task._find_contact_by_email(mock_client, 'notfound@test.com')
         assert result is None
+    
+    def test_test_client_upserts_as_new(self, tmp_path):
+        """Test the test-mode client reports every upserted record as new."""
+        task = HubSpotBulkImportTask(
+            csv_file=str(tmp_path / 'test.csv'),
+            object_type='companies'
+        )
+        
+        client = task._get_test_client()
+        results = task._import_companies(client, [
+            {'domain': 'test.com', 'success': 'true'},
+            {'domain': 'example.com', 'success': 'true'}
+        ])
+        
+        assert results['imported'] == 2
+        assert results['failed'] == 0
+        assert client.search_companies(limit=1) == {'results': []}
 
 
 class TestImportWrapperTasks:
@@ -377,6 +593,10 @@ class TestImportWrapperTasks:
             hubspot_token='test-token'
         )
         assert task.output().path == bulk_task.output().path
+        
+        # The bulk import runs as a dependency, not a nested luigi.build
+        assert task.requires() == bulk_task
+        assert task.requires().hubspot_token == 'test-token'
     
     def test_import_leads_task(self):
         """Test ImportLeadsTask."""
@@ -395,6 +615,10 @@ class TestImportWrapperTasks:
             hubspot_token='test-token'
         )
         assert task.output().path == bulk_task.output().path
+        
+        # The bulk import runs as a dependency, not a nested luigi.build
+        assert task.requires() == bulk_task
+        assert task.requires().hubspot_token == 'test-token'
     
     def test_import_all_task_requirements(self):
         """Test ImportAllTask requirements."""
@@ -4,7 +4,7 @@ import pytest
 from unittest.mock import Mock, patch, MagicMock
 import json
 
-from src.services.scraper import WebScraper
+from src.services.scraper import WebScraper, _extract_text
 from src.services.analyzer import AIAnalyzer
 from src.services.hubspot_service import HubSpotService
 from src.services.enrichment_service import EnrichmentService
@@ -41,6 +41,18 @@ class TestWebScraper:
         assert "sales@sub.example.com" in emails
         assert "contact@other.com" not in emails  # Different domain
     
+    def test_extract_text_small_page(self):
+        """Test regex fast path strips tags, scripts and entities."""
+        html = (
+            "<html><head><style>body { color: red; }</style>"
+            "<script>var x = '<b>';</script></head>"
+            "<body><h1>About&nbsp;Us</h1>\n<p>Tools &amp; services</p></body></html>"
+        )
+        
+        text = _extract_text(html)
+        
+        assert text == "About Us Tools & services"
+    
     def test_scrape_domain(self):
         """Test domain scraping."""
         scraper = WebScraper()
@@ -111,6 +123,50 @@ class TestAIAnalyzer:
             assert result.confidence_score == 0.9
 
 
+class TestAnalyzeLeadsBatch:
+    """Test AIAnalyzer.analyze_leads_batch."""
+    
+    def test_analyze_leads_batch_single_request(self):
+        """Test batch lead analysis issues one request per group."""
+        analyzer = AIAnalyzer()
+        
+        mock_client = Mock()
+        mock_client.chat_completion.return_value = {
+            "choices": [{"message": {"content": json.dumps([
+                {"buyer_persona": "End User", "lead_score_adjustment": 1,
+                 "confidence": 0.5, "reasoning": "first"},
+                {"buyer_persona": "Business Executive", "lead_score_adjustment": 5,
+                 "confidence": 0.8, "reasoning": "second"}
+            ])}}]
+        }
+        analyzer.client = mock_client
+        
+        lead_infos = [
+            {"firstname": "John", "lastname": "Doe", "email": "john@example.com", "company": "example.com"},
+            {"firstname": "Jane", "lastname": "Roe", "email": "jane@example.com", "company": "example.com"}
+        ]
+        
+        results = analyzer.analyze_leads_batch("Company content", lead_infos)
+        
+        assert mock_client.chat_completion.call_count == 1
+        assert [r.reasoning for r in results] == ["first", "second"]
+        assert results[1].buyer_persona == "Business Executive"
+    
+    def test_analyze_leads_batch_falls_back_per_lead(self):
+        """Test batch lead analysis falls back when the response doesn't match."""
+        analyzer = AIAnalyzer()
+        analyzer.client = Mock()
+        analyzer.client.chat_completion.return_value = {
+            "choices": [{"message": {"content": "[]"}}]
+        }
+        
+        with patch.object(analyzer, 'analyze_lead', return_value=None) as mock_analyze_lead:
+            results = analyzer.analyze_leads_batch("Company content", [{"email": "a@example.com"}, {"email": "b@example.com"}])
+        
+        assert results == [None, None]
+        assert mock_analyze_lead.call_count == 2
+
+
 class TestHubSpotService:
     """Test HubSpotService."""
     
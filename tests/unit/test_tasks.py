@@ -9,8 +9,12 @@ import tempfile
 import os
 
 from src.tasks.scrape import ScrapeWebsiteTask
-from src.tasks.enrich import EnrichCompanyTask, EnrichLeadsTask
-from src.tasks.export import ExportCompanyCSVTask, ExportLeadsCSVTask
+from src.tasks.enrich import EnrichDomainTask, EnrichCompanyTask, EnrichLeadsTask
+from src.tasks.export import (
+    ExportCompanyCSVTask,
+    ExportLeadsCSVTask,
+    ExportCompanyCSVBatchTask
+)
 
 
 class TestScrapeTask:
@@ -22,6 +26,11 @@ class TestScrapeTask:
         assert task.domain == "example.com"
         assert task.domain_safe == "example.com"
     
+    def test_domain_safe_strips_path_characters(self):
+        """Test domain_safe replaces slashes and drops colons."""
+        task = ScrapeWebsiteTask(domain="example.com:8080/about")
+        assert task.domain_safe == "example.com8080_about"
+    
     def test_output_path(self):
         """Test output path generation."""
         task = ScrapeWebsiteTask(domain="example.com")
@@ -100,12 +109,20 @@ class TestScrapeTask:
 class TestEnrichTasks:
     """Test enrichment tasks."""
     
+    def test_domain_task_requires(self):
+        """Test EnrichDomainTask requirements."""
+        task = EnrichDomainTask(domain="example.com")
+        requires = task.requires()
+        assert isinstance(requires, ScrapeWebsiteTask)
+        assert requires.domain == "example.com"
+    
     def test_company_task_requires(self):
-        """Test EnrichCompanyTask requirements."""
+        """Test EnrichCompanyTask shares the combined enrichment output."""
         task = EnrichCompanyTask(domain="example.com")
         requires = task.requires()
-        assert isinstance(requires, ScrapeWebsiteTask)
+        assert isinstance(requires, EnrichDomainTask)
         assert requires.domain == "example.com"
+        assert task.output().path == requires.output()["company"].path
     
     @patch('src.tasks.enrich.AIAnalyzer')
     def test_company_enrichment(self, mock_analyzer_class, temp_data_dir):
@@ -143,14 +160,16 @@ class TestEnrichTasks:
             }
         )
         
+        mock_analyzer.analyze_leads_batch.return_value = [None]
+        
         try:
-            task = EnrichCompanyTask(domain="example.com")
+            task = EnrichDomainTask(domain="example.com")
             # Mock the input
             task.input = lambda: Mock(path=str(input_path))
             task.run()
             
             # Check output
-            output_path = Path(task.output().path)
+            output_path = Path(task.output()["company"].path)
             assert output_path.exists()
             
             with open(output_path, 'r') as f:
@@ -158,19 +177,27 @@ class TestEnrichTasks:
             
             assert data['success'] is True
             assert data['analysis']['business_type_description'] == "Tech company"
+            
+            # Leads are written from the same read of the scraped content
+            with open(task.output()["leads"].path, 'r') as f:
+                leads_data = json.load(f)
+            
+            assert [lead['email'] for lead in leads_data['leads']] == ["info@example.com"]
+            mock_analyzer_class.assert_called_once()
         finally:
             os.chdir(original_cwd)
     
     def test_lead_task_requires(self):
-        """Test EnrichLeadsTask requirements."""
+        """Test EnrichLeadsTask shares the combined enrichment output."""
         task = EnrichLeadsTask(domain="example.com")
         requires = task.requires()
-        assert isinstance(requires, ScrapeWebsiteTask)
+        assert isinstance(requires, EnrichDomainTask)
         assert requires.domain == "example.com"
+        assert task.output().path == requires.output()["leads"].path
     
     def test_parse_email(self):
         """Test email parsing."""
-        task = EnrichLeadsTask(domain="example.com")
+        task = EnrichDomainTask(domain="example.com")
         
         # Test with dot separator
         result = task._parse_email("john.doe@example.com")
@@ -182,6 +209,11 @@ class TestEnrichTasks:
         assert result['first_name'] == "Jane"
         assert result['last_name'] == "Smith"
         
+        # Test mixed separators split on the highest-priority one
+        result = task._parse_email("mary-jane.smith@example.com")
+        assert result['first_name'] == "Mary-Jane"
+        assert result['last_name'] == "Smith"
+        
         # Test with no separator
         result = task._parse_email("admin@example.com")
         assert result['first_name'] == "Admin"
@@ -238,6 +270,37 @@ class TestExportTasks:
             assert len(rows) == 1
             assert rows[0]['domain'] == "example.com"
             assert rows[0]['business_type'] == "Tech company"
+            assert rows[0]['naics_code'] == "541511"
+            assert rows[0]['products_services'] == ""
+            assert rows[0]['confidence_score'] == "0.9"
+        finally:
+            os.chdir(original_cwd)
+    
+    def test_company_csv_batch_export(self, temp_data_dir):
+        """Test batch company CSV export writes one header and all rows."""
+        original_cwd = os.getcwd()
+        os.chdir(temp_data_dir)
+        
+        domains = ["example.com", "example.org"]
+        input_paths = []
+        for domain in domains:
+            input_path = Path(f"data/enriched_companies/raw/{domain}.json")
+            input_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(input_path, 'w') as f:
+                json.dump({"domain": domain, "success": True, "analysis": None}, f)
+            input_paths.append(input_path)
+        
+        try:
+            output_file = "output/companies.csv"
+            task = ExportCompanyCSVBatchTask(domains=domains, output_file=output_file)
+            task.input = lambda: [Mock(path=str(p)) for p in input_paths]
+            task.run()
+            
+            import csv
+            with open(output_file, 'r') as f:
+                rows = list(csv.DictReader(f))
+            
+            assert [row['domain'] for row in rows] == domains
         finally:
             os.chdir(original_cwd)
     